@@ -1,18 +1,37 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from langchain.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from app.vectorstore import build_vectorstore, save_vectorstore
+
+EMBED_BATCH_SIZE = 512
+EMBED_WORKERS = 4
+
 with open("data/docs.txt") as f:
     text = f.read()
 
+# Larger chunks mean fewer embedding calls and vectors; ~1000 chars is
+# ~250 tokens, far below the embedding model's 8191-token input limit.
 splitter = RecursiveCharacterTextSplitter(
-    chunk_size=500,
-    chunk_overlap=50
+    chunk_size=1000,
+    chunk_overlap=100
 )
 docs = splitter.create_documents([text])
 
-embeddings = OpenAIEmbeddings()
-vectorstore = FAISS.from_documents(docs, embeddings)
+# Embed in large batches (one request per batch instead of per chunk)
+embeddings = OpenAIEmbeddings(chunk_size=1000)
+texts = [d.page_content for d in docs]
+batches = [texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)]
+with ThreadPoolExecutor(max_workers=EMBED_WORKERS) as executor:
+    vectors = [v for batch in executor.map(embeddings.embed_documents, batches) for v in batch]
+
+vectorstore = build_vectorstore(
+    texts,
+    vectors,
+    embeddings,
+    metadatas=[d.metadata for d in docs]
+)
 
-vectorstore.save_local("vectorstore")
+save_vectorstore(vectorstore, "vectorstore")
 print("✅ Vector store built")
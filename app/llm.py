@@ -1,15 +1,43 @@
+import functools
 import os
+
+import httpx
 from dotenv import load_dotenv
 
 from langchain_openai import ChatOpenAI
 
-def get_llm():
-    load_dotenv()
-    print("API KEY:", os.getenv("OPENAI_API_KEY"))
+load_dotenv()
+
+# Shared connection pools so every request reuses kept-alive TLS connections.
+# They are created with the LLM, not at import, and closed on app shutdown:
+# an AsyncClient's pool belongs to the event loop that first uses it.
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+_http_clients = []
+
 
-    return ChatOpenAI(
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=120)
+    http_async_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=120)
+    llm = ChatOpenAI(
         model=os.getenv("LLM_MODEL_ID", "nvidia/nemotron-3-nano-30b-a3b:free"),
         temperature=0,
         openai_api_key=os.getenv("OPENAI_API_KEY"),
-        openai_api_base=os.getenv("OPENAI_API_BASE", "https://openrouter.ai/api/v1")
+        openai_api_base=os.getenv("OPENAI_API_BASE", "https://openrouter.ai/api/v1"),
+        http_client=http_client,
+        http_async_client=http_async_client
     )
+    # Only track the clients of an LLM that was actually built
+    _http_clients.extend((http_client, http_async_client))
+    return llm
+
+
+async def aclose_llm():
+    """Close the shared LLM's HTTP clients; the next get_llm() call builds fresh ones."""
+    get_llm.cache_clear()
+    while _http_clients:
+        client = _http_clients.pop()
+        if isinstance(client, httpx.AsyncClient):
+            await client.aclose()
+        else:
+            client.close()
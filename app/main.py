@@ -1,24 +1,48 @@
+from contextlib import asynccontextmanager
+
 from dotenv import load_dotenv
 
 load_dotenv()
 
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from langserve import add_routes
 
-from app.agent import get_agent
-from app.chains import get_rag_chain
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Import and build the chains at startup rather than import time, so
+    # importing the app (and spawning workers) doesn't pay for langchain/faiss.
+    if not getattr(app.state, "chains_ready", False):
+        from app.agent import get_agent
+        from app.chains import get_rag_chain
+
+        # A router per lifespan, so its routes can be dropped again on shutdown
+        router = APIRouter()
+        add_routes(router, get_agent(), path="/agent")
+        add_routes(router, get_rag_chain(), path="/rag")
+        app.router.routes.extend(router.routes)
+        app.state.chain_routes = list(router.routes)
+        app.state.chains_ready = True
+    yield
+
+    # Close the LLM's connection pools while the loop that opened them is still running
+    from app.llm import aclose_llm
+    await aclose_llm()
+
+    # The routes hold the LLM just closed; drop them so the next startup rebuilds them
+    for route in app.state.chain_routes:
+        app.router.routes.remove(route)
+    app.state.chain_routes = []
+    app.state.chains_ready = False
+    app.openapi_schema = None
+
 
 app = FastAPI(
     title="Agentic AI Backend",
-    version="1.0"
+    version="1.0",
+    lifespan=lifespan
 )
 
-agent = get_agent()
-rag_chain = get_rag_chain()
-
-add_routes(app, agent, path="/agent")
-add_routes(app, rag_chain, path="/rag")
-
 @app.get("/")
 def root():
     return {"status": "AI backend running"}
@@ -1,46 +1,89 @@
-from typing import Optional, Generator, List
+import asyncio
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Generator, Iterable, Iterator, List, Tuple
+from .cache import ChunkCache
 from .exceptions import PdfConverterException
-from .config import ConversionConfig, LLMProviderConfig
+from .config import ConversionConfig, LLMProviderConfig, default_concurrency
 from .message_builder import MessageBuilder
 from .utils import PdfChunk, PdfUtils, CsvProcessor, FileManager
 
+# Set once .env has been loaded, so each new converter doesn't re-read it
+_env_loaded = False
+
+# PDFs larger than this are never cached whole (their chunks still are)
+DOCUMENT_CACHE_MAX_BYTES = 100 * 1024 * 1024
+
 
 class PdfConverter:
     """Convert PDF documents to CSV format using LLMs."""
 
-    def __init__(self):
-        """Initialize the PDF converter."""
+    def __init__(self, cache_size: int = 256, cache_ttl: Optional[float] = 3600):
+        """
+        Initialize the PDF converter.
+
+        Args:
+            cache_size: Maximum number of converted chunks kept in memory (0 disables caching)
+            cache_ttl: Seconds a cached chunk stays valid (None for no expiry)
+        """
         self._load_environment()
-        self.llms = {}
-        self.already_converted = []
+        self.cache = ChunkCache(max_entries=cache_size, ttl=cache_ttl)
 
     def _load_environment(self):
-        """Load environment variables from .env file if available."""
+        """Load environment variables from .env file if available (once per process)."""
+        global _env_loaded
+        if _env_loaded:
+            return
+
         try:
             from dotenv import load_dotenv
             load_dotenv()
         except ImportError:
             # dotenv not installed, assume environment is already configured
             pass
+        _env_loaded = True
 
-    def _get_or_create_client(self, llm_type: str, max_retries: int):
-        """Get cached LLM client or create a new one."""
-        if llm_type not in self.llms:
-            self.llms[llm_type] = LLMProviderConfig.create_client(llm_type, max_retries=max_retries)
-        return self.llms[llm_type]
-
-    def _convert_chunk(
+    def _prepare_chunk(
         self,
         chunk_data: bytes,
-        llm,
         llm_type: str,
         chunk_info: str = "",
         is_first_chunk: bool = True,
         remove_header_if_not_first: bool = False,
         use_structured_messages: bool = False,
         extract_text: bool = False
-    ) -> str:
-        """Convert a single PDF chunk to CSV."""
+    ) -> Tuple[Optional[str], List[str], object]:
+        """
+        Look up a chunk in the cache and build its LLM message on a miss.
+
+        Returns:
+            Tuple of (cached CSV or None, cache keys for the chunk, message or None)
+        """
+        # Everything besides the PDF content that changes the expected CSV
+        variant = (
+            llm_type,
+            int(remove_header_if_not_first and not is_first_chunk),
+            int(use_structured_messages),
+            int(extract_text),
+        )
+        cache_keys = [ChunkCache.make_key(chunk_data, *variant)]
+        cached = self.cache.get_any(cache_keys)
+        if cached is not None:
+            return cached, cache_keys, None
+
+        extracted_text = None
+        if extract_text:
+            extracted_text = PdfUtils.extract_text(chunk_data)
+            if extracted_text:
+                cache_keys.append(ChunkCache.make_text_key(extracted_text, *variant))
+                cached = self.cache.get_any(cache_keys[1:])
+                if cached is not None:
+                    return cached, cache_keys, None
+                self._check_token_budget(extracted_text, llm_type, chunk_info)
+
         # Build prompt
         prompt = MessageBuilder.build_conversion_prompt(
             chunk_info=chunk_info,
@@ -54,19 +97,250 @@ class PdfConverter:
             chunk_data=chunk_data,
             llm_type=llm_type,
             use_structured_messages=use_structured_messages,
+            extract_text=False,
+            extracted_text=extracted_text
+        )
+        return None, cache_keys, message
+
+    @staticmethod
+    def _check_token_budget(text: str, llm_type: str, chunk_info: str = ""):
+        """Warn if extracted text will not fit in the provider's context window."""
+        context_tokens = LLMProviderConfig.get_context_tokens(llm_type)
+        if context_tokens is None:
+            return
+
+        token_count = LLMProviderConfig.count_tokens(llm_type, text)
+        if token_count > context_tokens:
+            print(
+                f"⚠️  Extracted text{chunk_info} is ~{token_count} tokens, over the "
+                f"{context_tokens}-token context of '{llm_type}'. Use a smaller max_pages_per_chunk."
+            )
+
+    def _cache_result(self, cache_keys: List[str], csv_data: str) -> str:
+        """Store a converted chunk under all of its cache keys."""
+        for key in cache_keys:
+            self.cache.set(key, csv_data)
+        return csv_data
+
+    @staticmethod
+    def _parse_response(response) -> str:
+        """Validate an LLM response and extract the CSV content."""
+        if not response or not hasattr(response, 'content'):
+            raise ValueError("Invalid response from LLM: no content")
+
+        # Clean and return
+        return CsvProcessor.clean_response(response.content)
+
+    def _convert_chunk(
+        self,
+        chunk_data: bytes,
+        llm,
+        llm_type: str,
+        chunk_info: str = "",
+        is_first_chunk: bool = True,
+        remove_header_if_not_first: bool = False,
+        use_structured_messages: bool = False,
+        extract_text: bool = False
+    ) -> str:
+        """Convert a single PDF chunk to CSV."""
+        cached, cache_keys, message = self._prepare_chunk(
+            chunk_data=chunk_data,
+            llm_type=llm_type,
+            chunk_info=chunk_info,
+            is_first_chunk=is_first_chunk,
+            remove_header_if_not_first=remove_header_if_not_first,
+            use_structured_messages=use_structured_messages,
             extract_text=extract_text
         )
 
+        if cached is not None:
+            return cached
+
         # Invoke LLM (LangChain handles retries automatically)
         response = llm.invoke([message])
+        return self._cache_result(cache_keys, self._parse_response(response))
+
+    async def _aconvert_chunk(
+        self,
+        chunk_data: bytes,
+        llm,
+        llm_type: str,
+        chunk_info: str = "",
+        is_first_chunk: bool = True,
+        remove_header_if_not_first: bool = False,
+        use_structured_messages: bool = False,
+        extract_text: bool = False
+    ) -> str:
+        """Convert a single PDF chunk to CSV without blocking the event loop."""
+        # Hashing, text extraction and base64 encoding are CPU-bound, so run them in a thread
+        cached, cache_keys, message = await asyncio.to_thread(
+            self._prepare_chunk,
+            chunk_data=chunk_data,
+            llm_type=llm_type,
+            chunk_info=chunk_info,
+            is_first_chunk=is_first_chunk,
+            remove_header_if_not_first=remove_header_if_not_first,
+            use_structured_messages=use_structured_messages,
+            extract_text=extract_text
+        )
+
+        if cached is not None:
+            return cached
+
+        response = await llm.ainvoke([message])
+        return self._cache_result(cache_keys, self._parse_response(response))
+
+    def _collect_results(
+        self,
+        results: Iterable,
+        config: ConversionConfig,
+        output_filename: Optional[str] = None
+    ) -> str:
+        """
+        Join per-chunk results in chunk order, stopping at the first failure.
+
+        Each item of ``results`` is either the CSV for that chunk or the
+        exception raised while converting it. Chunks are appended to a
+        temporary file as they arrive, which replaces ``output_filename``
+        only once every chunk has converted.
+        """
+        all_csv_data = []
+        temp_filename = f"{output_filename}.tmp" if output_filename else None
+        output_file = FileManager.open_output(temp_filename)
+        completed = False
+
+        try:
+            for i, csv_data in enumerate(results):
+                if isinstance(csv_data, Exception):
+                    print(f"❌ Failed to convert chunk {i+1} after all retries: {str(csv_data)}")
+                    return self._handle_chunk_failure(all_csv_data, output_filename, i, csv_data)
+
+                # Remove header if needed
+                if config.remove_header_if_not_first and i > 0 and csv_data:
+                    csv_data = CsvProcessor.remove_header(csv_data)
+
+                all_csv_data.append(csv_data)
+
+                # Write to file incrementally
+                if output_file:
+                    try:
+                        if i > 0:
+                            output_file.write(b'\n')
+                        output_file.write(csv_data.encode('utf-8'))
+                    except Exception as e:
+                        print(f"❌ Failed to write to output file: {str(e)}")
+                        FileManager.discard_output(output_file, temp_filename)
+                        output_file = None
+            completed = True
+        finally:
+            if output_file:
+                if completed:
+                    FileManager.commit_output(output_file, temp_filename, output_filename, "CSV output")
+                else:
+                    FileManager.discard_output(output_file, temp_filename)
+
+        # Skip building the full string when the caller only wants the file
+        if output_filename and not config.return_full:
+            return ""
+        result = '\n'.join(all_csv_data)
+        if config.document_cache_key:
+            self.cache.set(config.document_cache_key, result)
+        return result
 
+    @staticmethod
+    def _iter_future_results(futures: List[Future]) -> Iterator:
+        """Yield future results in order, ending with the first exception raised."""
+        for i, future in enumerate(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # Don't start chunks we are going to throw away
+                for pending in futures[i + 1:]:
+                    pending.cancel()
+                yield e
+                return
+
+    @staticmethod
+    def _iter_split_chunks(chunks: Iterable[PdfChunk]) -> Iterator[PdfChunk]:
+        """Yield chunks from a (possibly lazy) split, raising split errors as PdfConverterException."""
+        chunks = iter(chunks)
+        while True:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+            except Exception as e:
+                raise PdfConverterException(f"Failed to prepare PDF: {str(e)}") from e
+            yield chunk
+
+    def _process_chunks(
+        self,
+        chunks: Iterable[PdfChunk],
+        llm,
+        llm_type: str,
+        config: ConversionConfig,
+        output_filename: Optional[str] = None,
+        chunk_count: Optional[int] = None
+    ) -> str:
+        """
+        Process multiple PDF chunks concurrently, preserving chunk order.
+
+        ``chunks`` may be a lazy iterator (give ``chunk_count`` then): each chunk
+        is submitted as soon as it is split, so splitting overlaps with the
+        LLM calls already in flight.
+        """
+        if chunk_count is None:
+            chunk_count = len(chunks)
+        max_workers = max(1, min(chunk_count, config.max_concurrent_llm_tasks))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            try:
+                for i, chunk in enumerate(self._iter_split_chunks(chunks)):
+                    chunk_info = f" ({chunk.page_range})"
+                    print(f"Converting chunk {i+1}/{chunk_count}{chunk_info}...")
+                    futures.append(executor.submit(
+                        self._convert_chunk,
+                        chunk_data=chunk.data,
+                        llm=llm,
+                        llm_type=llm_type,
+                        chunk_info=chunk_info,
+                        is_first_chunk=(i == 0),
+                        remove_header_if_not_first=config.remove_header_if_not_first,
+                        use_structured_messages=config.use_structured_messages,
+                        extract_text=config.extract_text
+                    ))
+            except PdfConverterException:
+                # The PDF couldn't be split: don't convert the chunks already queued
+                for future in futures:
+                    future.cancel()
+                raise
+
+            return self._collect_results(self._iter_future_results(futures), config, output_filename)
+
+    def _convert_chunk_group(
+        self,
+        group: List[Tuple[int, PdfChunk]],
+        llm,
+        llm_type: str,
+        config: ConversionConfig
+    ) -> List[str]:
+        """Convert several chunks with a single LLM request, returning one CSV per chunk."""
+        message = MessageBuilder.build_multi_chunk_message(
+            chunks=[(i + 1, chunk.data, f" ({chunk.page_range})") for i, chunk in group],
+            llm_type=llm_type,
+            use_structured_messages=config.use_structured_messages,
+            extract_text=config.extract_text,
+            remove_header_if_not_first=config.remove_header_if_not_first
+        )
+
+        response = llm.invoke([message])
         if not response or not hasattr(response, 'content'):
             raise ValueError("Invalid response from LLM: no content")
 
-        # Clean and return
-        return CsvProcessor.clean_response(response.content)
+        return CsvProcessor.split_multi_chunk_response(response.content, [i + 1 for i, _ in group])
 
-    def _process_chunks(
+    def _process_chunks_grouped(
         self,
         chunks: List[PdfChunk],
         llm,
@@ -74,15 +348,44 @@ class PdfConverter:
         config: ConversionConfig,
         output_filename: Optional[str] = None
     ) -> str:
-        """Process multiple PDF chunks."""
-        all_csv_data = []
+        """Process chunks ``config.chunks_per_request`` at a time per LLM request, preserving chunk order."""
+        size = config.chunks_per_request
+        indexed = list(enumerate(chunks))
+        groups = [indexed[start:start + size] for start in range(0, len(indexed), size)]
+        max_workers = max(1, min(len(groups), config.max_concurrent_llm_tasks))
+
+        def iter_chunk_results():
+            for group_result in self._iter_future_results(futures):
+                if isinstance(group_result, Exception):
+                    yield group_result
+                    return
+                yield from group_result
 
-        for i, chunk in enumerate(chunks):
-            chunk_info = f" ({chunk.page_range})"
-            print(f"Converting chunk {i+1}/{len(chunks)}{chunk_info}...")
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for group in groups:
+                first, last = group[0][0] + 1, group[-1][0] + 1
+                print(f"Converting chunks {first}-{last}/{len(chunks)} in one request...")
+                futures.append(executor.submit(self._convert_chunk_group, group, llm, llm_type, config))
 
-            try:
-                csv_data = self._convert_chunk(
+            return self._collect_results(iter_chunk_results(), config, output_filename)
+
+    async def _aprocess_chunks(
+        self,
+        chunks: List[PdfChunk],
+        llm,
+        llm_type: str,
+        config: ConversionConfig,
+        output_filename: Optional[str] = None
+    ) -> str:
+        """Process multiple PDF chunks with asyncio, preserving chunk order."""
+        semaphore = asyncio.Semaphore(max(1, config.max_concurrent_llm_tasks))
+
+        async def convert_one(i: int, chunk: PdfChunk) -> str:
+            chunk_info = f" ({chunk.page_range})"
+            async with semaphore:
+                print(f"Converting chunk {i+1}/{len(chunks)}{chunk_info}...")
+                return await self._aconvert_chunk(
                     chunk_data=chunk.data,
                     llm=llm,
                     llm_type=llm_type,
@@ -93,17 +396,100 @@ class PdfConverter:
                     extract_text=config.extract_text
                 )
 
-                # Remove header if needed
-                if config.remove_header_if_not_first and i > 0 and csv_data:
-                    csv_data = CsvProcessor.remove_header(csv_data)
+        results = await asyncio.gather(
+            *[convert_one(i, chunk) for i, chunk in enumerate(chunks)],
+            return_exceptions=True
+        )
+        return await asyncio.to_thread(self._collect_results, results, config, output_filename)
 
-                all_csv_data.append(csv_data)
+    def _process_chunks_batch(
+        self,
+        chunks: List[PdfChunk],
+        llm_type: str,
+        config: ConversionConfig,
+        output_filename: Optional[str] = None
+    ) -> str:
+        """
+        Process multiple PDF chunks as a single OpenAI Batch API job.
 
-            except Exception as e:
-                print(f"❌ Failed to convert chunk {i+1} after all retries: {str(e)}")
-                return self._handle_chunk_failure(all_csv_data, output_filename, i, e)
+        Batch jobs cost about half as much as individual requests, but run
+        asynchronously and may take up to 24 hours to complete.
+        """
+        try:
+            import openai
+        except ImportError as e:
+            raise PdfConverterException(
+                "openai is required for the batch API but is not installed. Install with: pip install openai"
+            ) from e
 
-        return '\n'.join(all_csv_data)
+        results: List[object] = [None] * len(chunks)
+        pending = {}
+        batch_lines = []
+        model = LLMProviderConfig.MODEL_CONFIGS[llm_type]["model"]
+
+        for i, chunk in enumerate(chunks):
+            cached, cache_keys, message = self._prepare_chunk(
+                chunk_data=chunk.data,
+                llm_type=llm_type,
+                chunk_info=f" ({chunk.page_range})",
+                is_first_chunk=(i == 0),
+                remove_header_if_not_first=config.remove_header_if_not_first,
+                use_structured_messages=config.use_structured_messages,
+                extract_text=config.extract_text
+            )
+            if cached is not None:
+                results[i] = cached
+                continue
+
+            custom_id = f"chunk-{i}"
+            pending[custom_id] = (i, cache_keys)
+            batch_lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "temperature": 0,
+                    "messages": [{"role": "user", "content": message.content}],
+                },
+            }))
+
+        if pending:
+            client = openai.OpenAI()
+            print(f"Submitting {len(pending)} chunks as a batch job...")
+            batch_file = client.files.create(
+                file=("chunks.jsonl", "\n".join(batch_lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+
+            while batch.status not in {"completed", "failed", "expired", "cancelled"}:
+                time.sleep(config.batch_poll_interval)
+                batch = client.batches.retrieve(batch.id)
+            print(f"Batch job {batch.id} {batch.status}")
+
+            # Successful requests are in the output file, failed ones in the error file
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if not file_id:
+                    continue
+                for line in client.files.content(file_id).text.splitlines():
+                    record = json.loads(line)
+                    i, cache_keys = pending.pop(record["custom_id"])
+                    response = record.get("response") or {}
+                    if response.get("status_code") == 200:
+                        content = response["body"]["choices"][0]["message"]["content"]
+                        results[i] = self._cache_result(cache_keys, CsvProcessor.clean_response(content))
+                    else:
+                        results[i] = ValueError(f"Batch request failed: {record.get('error') or response.get('body')}")
+
+            for i, _ in pending.values():
+                results[i] = ValueError(f"Batch job {batch.id} {batch.status} without a result for this chunk")
+
+        return self._collect_results(results, config, output_filename)
 
     def _handle_chunk_failure(
         self,
@@ -120,7 +506,7 @@ class PdfConverter:
 
             if output_filename:
                 failure_filename = f"{output_filename}.incomplete"
-                FileManager.save_to_file(result, failure_filename, "incomplete results")
+                FileManager.save_chunks(all_csv_data, failure_filename, "incomplete results")
 
             return result
         else:
@@ -128,6 +514,61 @@ class PdfConverter:
                 f"Failed to convert any chunks. Error on chunk {chunk_index + 1}: {str(error)}"
             ) from error
 
+    def _prepare_conversion(
+        self,
+        input_filename: str,
+        llm_type: str,
+        config: ConversionConfig
+    ) -> Tuple[object, bytes, int]:
+        """
+        Get the LLM client, the contents of the input PDF and its page count.
+
+        Also sets ``config.content_key``, so the PDF is hashed once for every cache lookup.
+        """
+        # Clients are cached process-wide, so converters share connection pools
+        llm = LLMProviderConfig.create_client(llm_type, max_retries=config.max_retries)
+
+        # Read the PDF once; splitting and single-pass conversion reuse the bytes
+        try:
+            pdf_data = PdfUtils.read_pdf(input_filename)
+            config.content_key = PdfUtils.content_key(pdf_data)
+            page_count = PdfUtils.get_page_count(pdf_data, config.content_key)
+            print(f"PDF has {page_count} pages")
+        except Exception as e:
+            raise PdfConverterException(f"Failed to read PDF: {str(e)}") from e
+
+        return llm, pdf_data, page_count
+
+    def _get_cached_document(
+        self,
+        pdf_data: bytes,
+        llm_type: str,
+        config: ConversionConfig,
+        output_filename: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Return the cached CSV for a previously converted PDF, saving it to output_filename.
+
+        On a miss, sets ``config.document_cache_key`` so the result is cached once
+        every chunk has converted.
+        """
+        if len(pdf_data) > DOCUMENT_CACHE_MAX_BYTES:
+            return None
+
+        content_key = config.content_key or PdfUtils.content_key(pdf_data)
+        config.document_cache_key = ChunkCache.derive_key(
+            content_key, "document", llm_type, config.max_pages_per_chunk,
+            config.remove_header_if_not_first, config.use_structured_messages, config.extract_text
+        )
+        result = self.cache.get(config.document_cache_key)
+        if result is None:
+            return None
+
+        print("✓ Using cached conversion")
+        if output_filename:
+            FileManager.save_to_file(result, output_filename, "CSV output")
+        return result
+
     def convert(
         self,
         input_filename: str,
@@ -138,7 +579,12 @@ class PdfConverter:
         remove_header_if_not_first: bool = False,
         max_retries: int = 3,
         use_structured_messages: bool = False,
-        extract_text: bool = False
+        extract_text: bool = False,
+        max_concurrent_llm_tasks: Optional[int] = None,
+        use_async: bool = False,
+        use_batch_api: bool = False,
+        return_full: bool = True,
+        chunks_per_request: int = 1
     ) -> str:
         """
         Convert PDF to CSV with automatic chunking for large files.
@@ -153,6 +599,14 @@ class PdfConverter:
             max_retries: Maximum number of retries per chunk
             use_structured_messages: Use structured multimodal messages (provider-dependent)
             extract_text: Extract text from PDF instead of sending as image
+            max_concurrent_llm_tasks: Maximum number of chunks converted concurrently
+                (default: PDF_CONVERTER_CONCURRENCY env var, else 5)
+            use_async: Run the conversion through ``aconvert`` on a new event loop
+                (one chunk per request: use_batch_api and chunks_per_request are ignored)
+            use_batch_api: Submit all chunks as one batch job (cheaper, but slow; 'openai' only)
+            return_full: Return the CSV content; set False with output_filename to only
+                write the file and skip building the joined string for chunked PDFs
+            chunks_per_request: Convert this many chunks per LLM request (provider-dependent)
 
         Returns:
             str: The converted CSV content
@@ -160,38 +614,72 @@ class PdfConverter:
         Raises:
             PdfConverterException: If conversion fails completely
         """
+        if use_async:
+            if use_batch_api or chunks_per_request > 1:
+                print("⚠️  use_async ignores use_batch_api and chunks_per_request, sending one chunk per request")
+            return asyncio.run(self.aconvert(
+                input_filename=input_filename,
+                output_filename=output_filename,
+                llm_type=llm_type,
+                max_pages_per_chunk=max_pages_per_chunk,
+                auto_chunk=auto_chunk,
+                remove_header_if_not_first=remove_header_if_not_first,
+                max_retries=max_retries,
+                use_structured_messages=use_structured_messages,
+                extract_text=extract_text,
+                max_concurrent_llm_tasks=max_concurrent_llm_tasks,
+                return_full=return_full
+            ))
+
         config = ConversionConfig(
             max_pages_per_chunk=LLMProviderConfig.get_max_chunk_pages(llm_type, max_pages_per_chunk),
             auto_chunk=auto_chunk,
             remove_header_if_not_first=remove_header_if_not_first,
             max_retries=max_retries,
             use_structured_messages=use_structured_messages,
-            extract_text=extract_text
+            extract_text=extract_text,
+            max_concurrent_llm_tasks=max_concurrent_llm_tasks or default_concurrency(),
+            use_batch_api=use_batch_api,
+            return_full=return_full,
+            chunks_per_request=chunks_per_request
         )
+        llm, pdf_data, page_count = self._prepare_conversion(input_filename, llm_type, config)
 
-        # Get or create LLM client
-        llm = self._get_or_create_client(llm_type, max_retries)
+        if config.use_batch_api and not LLMProviderConfig.supports_batch_api(llm_type):
+            print(f"⚠️  '{llm_type}' has no batch API, converting chunks with individual requests")
+            config.use_batch_api = False
 
-        # Check PDF size
-        try:
-            page_count = PdfUtils.get_page_count(input_filename)
-            print(f"PDF has {page_count} pages")
-        except Exception as e:
-            raise PdfConverterException(f"Failed to read PDF: {str(e)}") from e
+        if config.chunks_per_request > 1 and not LLMProviderConfig.supports_multi_chunk_requests(llm_type):
+            print(f"⚠️  '{llm_type}' can't take several chunks per request, sending one chunk per request")
+            config.chunks_per_request = 1
 
         # Process PDF
         try:
             if config.auto_chunk and page_count > config.max_pages_per_chunk:
-                # Chunked processing
+                # Chunked processing (single-pass results are cached by _convert_chunk)
+                cached = self._get_cached_document(pdf_data, llm_type, config, output_filename)
+                if cached is not None:
+                    return cached
+
                 print(f"Chunking PDF into segments of {config.max_pages_per_chunk} pages...")
-                chunks = PdfUtils.split_into_chunks(input_filename, config.max_pages_per_chunk)
-                result = self._process_chunks(chunks, llm, llm_type, config, output_filename)
+                if config.use_batch_api:
+                    chunks = PdfUtils.split_into_chunks(pdf_data, config.max_pages_per_chunk, config.content_key)
+                    result = self._process_chunks_batch(chunks, llm_type, config, output_filename)
+                elif config.chunks_per_request > 1:
+                    chunks = PdfUtils.split_into_chunks(pdf_data, config.max_pages_per_chunk, config.content_key)
+                    result = self._process_chunks_grouped(chunks, llm, llm_type, config, output_filename)
+                else:
+                    # Split lazily so the first chunks are converting while later ones are split
+                    chunks = PdfUtils.iter_chunks(
+                        pdf_data, config.max_pages_per_chunk, content_key=config.content_key
+                    )
+                    chunk_count = -(-page_count // config.max_pages_per_chunk)
+                    result = self._process_chunks(
+                        chunks, llm, llm_type, config, output_filename, chunk_count=chunk_count
+                    )
             else:
                 # Single-pass processing
                 print("Converting entire PDF...")
-                with open(input_filename, "rb") as f:
-                    pdf_data = f.read()
-
                 result = self._convert_chunk(
                     chunk_data=pdf_data,
                     llm=llm,
@@ -201,14 +689,91 @@ class PdfConverter:
                     extract_text=config.extract_text
                 )
 
+                # Save to file if requested (chunked results are written as they arrive)
+                if output_filename:
+                    FileManager.save_to_file(result, output_filename, "CSV output")
+
         except PdfConverterException:
             raise
         except Exception as e:
             raise PdfConverterException(f"Failed to convert PDF: {str(e)}") from e
 
-        # Save to file if requested
-        if output_filename:
-            FileManager.save_to_file(result, output_filename, "CSV output")
+        return result
+
+    async def aconvert(
+        self,
+        input_filename: str,
+        output_filename: Optional[str] = None,
+        llm_type: str = "openrouter",
+        max_pages_per_chunk: int = 10,
+        auto_chunk: bool = True,
+        remove_header_if_not_first: bool = False,
+        max_retries: int = 3,
+        use_structured_messages: bool = False,
+        extract_text: bool = False,
+        max_concurrent_llm_tasks: Optional[int] = None,
+        return_full: bool = True
+    ) -> str:
+        """
+        Async version of ``convert``: chunks are sent with ``llm.ainvoke``
+        and awaited together, at most ``max_concurrent_llm_tasks`` at a time.
+
+        Takes the same arguments and returns the same CSV content as ``convert``,
+        except for use_batch_api and chunks_per_request. Reading, splitting and
+        file writes run in worker threads, so the event loop stays responsive.
+
+        Raises:
+            PdfConverterException: If conversion fails completely
+        """
+        config = ConversionConfig(
+            max_pages_per_chunk=LLMProviderConfig.get_max_chunk_pages(llm_type, max_pages_per_chunk),
+            auto_chunk=auto_chunk,
+            remove_header_if_not_first=remove_header_if_not_first,
+            max_retries=max_retries,
+            use_structured_messages=use_structured_messages,
+            extract_text=extract_text,
+            max_concurrent_llm_tasks=max_concurrent_llm_tasks or default_concurrency(),
+            return_full=return_full
+        )
+        llm, pdf_data, page_count = await asyncio.to_thread(
+            self._prepare_conversion, input_filename, llm_type, config
+        )
+
+        # Process PDF
+        try:
+            if config.auto_chunk and page_count > config.max_pages_per_chunk:
+                # Chunked processing (single-pass results are cached by _aconvert_chunk)
+                cached = await asyncio.to_thread(
+                    self._get_cached_document, pdf_data, llm_type, config, output_filename
+                )
+                if cached is not None:
+                    return cached
+
+                print(f"Chunking PDF into segments of {config.max_pages_per_chunk} pages...")
+                chunks = await asyncio.to_thread(
+                    PdfUtils.split_into_chunks, pdf_data, config.max_pages_per_chunk, config.content_key
+                )
+                result = await self._aprocess_chunks(chunks, llm, llm_type, config, output_filename)
+            else:
+                # Single-pass processing
+                print("Converting entire PDF...")
+                result = await self._aconvert_chunk(
+                    chunk_data=pdf_data,
+                    llm=llm,
+                    llm_type=llm_type,
+                    is_first_chunk=True,
+                    use_structured_messages=config.use_structured_messages,
+                    extract_text=config.extract_text
+                )
+
+                # Save to file if requested (chunked results are written as they arrive)
+                if output_filename:
+                    await asyncio.to_thread(FileManager.save_to_file, result, output_filename, "CSV output")
+
+        except PdfConverterException:
+            raise
+        except Exception as e:
+            raise PdfConverterException(f"Failed to convert PDF: {str(e)}") from e
 
         return result
 
@@ -221,12 +786,15 @@ class PdfConverter:
         remove_header_if_not_first: bool = False,
         max_retries: int = 3,
         use_structured_messages: bool = False,
-        extract_text: bool = False
+        extract_text: bool = False,
+        flush_every_chunks: int = 0,
+        max_concurrent_llm_tasks: Optional[int] = None
     ) -> Generator[str, None, None]:
         """
         Convert PDF to CSV with streaming responses for each chunk.
 
-        Yields CSV data as it's generated.
+        Up to ``max_concurrent_llm_tasks`` chunks are converted ahead in the
+        background; CSV data is still yielded in chunk order.
 
         Args:
             input_filename: Path to input PDF
@@ -237,6 +805,9 @@ class PdfConverter:
             max_retries: Maximum number of retries per chunk
             use_structured_messages: Use structured multimodal messages
             extract_text: Extract text from PDF instead of sending as image
+            flush_every_chunks: Flush the output file every N chunks (0 to only flush on close)
+            max_concurrent_llm_tasks: Maximum number of chunks converted concurrently
+                (default: PDF_CONVERTER_CONCURRENCY env var, else 5)
 
         Yields:
             str: CSV data for each successfully converted chunk
@@ -249,46 +820,59 @@ class PdfConverter:
             remove_header_if_not_first=remove_header_if_not_first,
             max_retries=max_retries,
             use_structured_messages=use_structured_messages,
-            extract_text=extract_text
+            extract_text=extract_text,
+            max_concurrent_llm_tasks=max_concurrent_llm_tasks or default_concurrency()
         )
 
-        # Get or create LLM client
-        llm = self._get_or_create_client(llm_type, max_retries)
+        # Clients are cached process-wide, so converters share connection pools
+        llm = LLMProviderConfig.create_client(llm_type, max_retries=max_retries)
 
         # Prepare chunks
         try:
-            page_count = PdfUtils.get_page_count(input_filename)
+            pdf_data = PdfUtils.read_pdf(input_filename)
+            page_count = PdfUtils.get_page_count(pdf_data)
             print(f"PDF has {page_count} pages")
-            chunks = PdfUtils.split_into_chunks(input_filename, config.max_pages_per_chunk)
+            # Chunks are built as the stream reaches them rather than all up front
+            chunks = PdfUtils.iter_chunks(pdf_data, config.max_pages_per_chunk, cache=False)
+            chunk_count = -(-page_count // config.max_pages_per_chunk)
         except Exception as e:
             raise PdfConverterException(f"Failed to prepare PDF: {str(e)}") from e
 
         # Open output file if specified
-        output_file = None
-        if output_filename:
-            try:
-                output_file = open(output_filename, 'w', encoding='utf-8')
-            except Exception as e:
-                print(f"❌ Failed to open output file: {str(e)}")
+        output_file = FileManager.open_output(output_filename)
 
         all_csv_data = []
+        max_workers = max(1, config.max_concurrent_llm_tasks)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        indexed_chunks = enumerate(self._iter_split_chunks(chunks))
 
+        def submit(i: int, chunk: PdfChunk) -> Future:
+            chunk_info = f" ({chunk.page_range})"
+            print(f"Converting chunk {i+1}/{chunk_count}{chunk_info}...")
+            return executor.submit(
+                self._convert_chunk,
+                chunk_data=chunk.data,
+                llm=llm,
+                llm_type=llm_type,
+                chunk_info=chunk_info,
+                is_first_chunk=(i == 0),
+                remove_header_if_not_first=config.remove_header_if_not_first,
+                use_structured_messages=config.use_structured_messages,
+                extract_text=config.extract_text
+            )
+
+        pending = deque()
         try:
-            for i, chunk in enumerate(chunks):
-                chunk_info = f" ({chunk.page_range})"
-                print(f"Converting chunk {i+1}/{len(chunks)}{chunk_info}...")
+            pending.extend(submit(i, chunk) for i, chunk in itertools.islice(indexed_chunks, max_workers))
+            i = 0
+            while pending:
+                future = pending.popleft()
+                # Keep the window full: start the next chunk before waiting on this one
+                for next_i, next_chunk in itertools.islice(indexed_chunks, 1):
+                    pending.append(submit(next_i, next_chunk))
 
                 try:
-                    csv_data = self._convert_chunk(
-                        chunk_data=chunk.data,
-                        llm=llm,
-                        llm_type=llm_type,
-                        chunk_info=chunk_info,
-                        is_first_chunk=(i == 0),
-                        remove_header_if_not_first=config.remove_header_if_not_first,
-                        use_structured_messages=config.use_structured_messages,
-                        extract_text=config.extract_text
-                    )
+                    csv_data = future.result()
 
                     # Remove header if needed
                     if config.remove_header_if_not_first and i > 0:
@@ -299,10 +883,11 @@ class PdfConverter:
                     # Write to file incrementally
                     if output_file:
                         try:
-                            output_file.write(csv_data)
-                            if i < len(chunks) - 1:
-                                output_file.write('\n')
-                            output_file.flush()
+                            output_file.write(csv_data.encode('utf-8'))
+                            if i < chunk_count - 1:
+                                output_file.write(b'\n')
+                            if flush_every_chunks > 0 and (i + 1) % flush_every_chunks == 0:
+                                output_file.flush()
                         except Exception as e:
                             print(f"❌ Failed to write to output file: {str(e)}")
 
@@ -319,7 +904,17 @@ class PdfConverter:
                     print(f"💾 Stopping stream at chunk {i+1}.")
                     return
 
+                i += 1
+
+        except PdfConverterException:
+            # The PDF couldn't be split: don't convert the chunks already queued
+            for future in pending:
+                future.cancel()
+            raise
+
         finally:
+            # Don't start chunks nobody will read (stream failed or was abandoned)
+            executor.shutdown(wait=False, cancel_futures=True)
             if output_file:
                 try:
                     output_file.close()
@@ -2,25 +2,44 @@ try:
     import PyPDF2
 except Exception:  # pragma: no cover - import-time fallback for environments without PyPDF2
     PyPDF2 = None
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - pure-Python fallback for _find_common_prefix
+    np = None
 from io import BytesIO
+import csv
 import re
-from typing import List
+from typing import Iterator, List
 
-def pdf_to_text(content: bytes) -> str:
+# Below this many pages the numpy setup costs more than the Python loop saves
+_NUMPY_MIN_STRINGS = 4
+
+_RE_BLANK_LINES = re.compile(r"\n{2,}")
+_RE_WHITESPACE = re.compile(r"\s+")
+
+def _extract_page_text(page) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _iter_page_texts(content: bytes) -> Iterator[str]:
+    """Parse the PDF now and lazily yield the text of each page in order."""
     reader = PyPDF2.PdfReader(BytesIO(content))
-    txt = []
-    for p in reader.pages:
-        try:
-            txt.append(p.extract_text() or "")
-        except:
-            txt.append("")
-    
-    return "\n".join(txt)
+    return (_extract_page_text(page) for page in reader.pages)
+
+
+def pdf_to_text(content: bytes) -> str:
+    return "\n".join(_iter_page_texts(content))
 
 
 def _find_common_prefix(strings: List[str], max_len: int = 1000) -> str:
     if not strings:
         return ""
+    if np is not None and len(strings) >= _NUMPY_MIN_STRINGS:
+        return _find_common_prefix_numpy(strings, max_len)
+
     # Work on a truncated version to avoid huge comparisons
     s0 = strings[0][:max_len]
     prefix_len = len(s0)
@@ -35,29 +54,42 @@ def _find_common_prefix(strings: List[str], max_len: int = 1000) -> str:
     return s0[:prefix_len]
 
 
+def _find_common_prefix_numpy(strings: List[str], max_len: int = 1000) -> str:
+    # One row of code points per string (UTF-32 keeps indices in characters),
+    # padded with a value that is never a valid code point.
+    truncated = [s[:max_len] for s in strings]
+    width = max(len(s) for s in truncated)
+    if width == 0:
+        return ""
+
+    rows = np.full((len(truncated), width), 0xFFFFFFFF, dtype=np.uint32)
+    for row, s in zip(rows, truncated):
+        row[:len(s)] = np.frombuffer(s.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+    all_equal = (rows == rows[0]).all(axis=0)
+    prefix_len = width if all_equal.all() else int(np.argmin(all_equal))
+    return truncated[0][:prefix_len]
+
+
 def _normalize_text(text: str, preserve_newlines: bool = False) -> str:
-    # Normalize CRLF
-    text = text.replace("\r\n", "\n")
     if preserve_newlines:
-        # Collapse multiple blank lines and strip
-        text = re.sub(r"\n{2,}", "\n", text).strip()
-    else:
-        # Replace newlines with spaces and collapse whitespace
-        text = re.sub(r"\s+", " ", text).strip()
-    return text
+        # Normalize CRLF, collapse multiple blank lines and strip
+        text = text.replace("\r\n", "\n")
+        return _RE_BLANK_LINES.sub("\n", text).strip()
+    # Replace newlines (including CRLF) with spaces and collapse whitespace
+    return _RE_WHITESPACE.sub(" ", text).strip()
 
 
 def pdf_to_csv(content: bytes, output_path: str, *, dedupe_header: bool = True,
                preserve_newlines: bool = False) -> None:
-    reader = PyPDF2.PdfReader(BytesIO(content))
-    pages = []
-    for page in reader.pages:
-        try:
-            pages.append(page.extract_text() or "")
-        except Exception:
-            pages.append("")
+    # Pages are streamed straight to the writer unless header dedupe needs them all
+    pages = _iter_page_texts(content)
 
     # Optionally remove a common prefix (header/footer that repeats on every page)
+    strip_len = 0
+    if dedupe_header:
+        pages = list(pages)
+
     if dedupe_header and len(pages) > 1:
         prefix = _find_common_prefix(pages, max_len=1000)
         # If the computed prefix runs into varying content like "page1" vs "page2",
@@ -66,15 +98,16 @@ def pdf_to_csv(content: bytes, output_path: str, *, dedupe_header: bool = True,
             last_nl = prefix.rfind("\n")
             prefix = prefix[: last_nl + 1]
 
-        # Only strip meaningful prefixes (avoid stripping tiny tokens)
+        # Only strip meaningful prefixes (avoid stripping tiny tokens).
+        # The prefix is shared by every page by construction, so no need to re-check it
         if len(prefix.strip()) >= 10:
-            pages = [p[len(prefix):] if p.startswith(prefix) else p for p in pages]
+            strip_len = len(prefix)
 
+    # Strip, normalize and write each page in a single pass
     with open(output_path, "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["page", "text"])
         for i, text in enumerate(pages, start=1):
-            text = _normalize_text(text, preserve_newlines=preserve_newlines)
+            text = _normalize_text(text[strip_len:], preserve_newlines=preserve_newlines)
             writer.writerow([i, text])
     return 0
-
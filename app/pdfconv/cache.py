@@ -0,0 +1,99 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Tuple
+try:
+    import xxhash
+except ImportError:  # optional SIMD hash, blake2b is used otherwise
+    xxhash = None
+
+
+class ChunkCache:
+    """Thread-safe in-memory LRU cache for PDF conversion results."""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 3600, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_entries: Maximum number of cached entries (0 disables caching)
+            ttl: Seconds an entry stays valid (None for no expiry)
+            max_bytes: Maximum total size of cached values, as given to set() (None for no limit)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(data: bytes, *parts) -> str:
+        """Build a cache key from a content hash and the parameters that affect the output."""
+        if xxhash is not None:
+            digest = xxhash.xxh3_128_hexdigest(data)
+        else:
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        return ChunkCache.derive_key(digest, *parts)
+
+    @staticmethod
+    def derive_key(content_key: str, *parts) -> str:
+        """Extend a key from make_key() with more parameters, without re-hashing the content."""
+        return ":".join([content_key, *(str(part) for part in parts)])
+
+    @staticmethod
+    def make_text_key(text: str, *parts) -> str:
+        """Build a cache key from extracted text, ignoring whitespace differences."""
+        normalized = " ".join(text.split())
+        return "text:" + ChunkCache.make_key(normalized.encode("utf-8"), *parts)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            stored_at, value, size = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                self._total_bytes -= size
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def get_any(self, keys: Iterable[str]) -> Optional[Any]:
+        """Return the value of the first key that is cached."""
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                return value
+        return None
+
+    def set(self, key: str, value: Any, size: int = 0):
+        """Store a value of the given size in bytes, evicting the least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[2]
+            self._entries[key] = (time.monotonic(), value, size)
+            self._total_bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
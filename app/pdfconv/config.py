@@ -1,8 +1,16 @@
+import functools
 import os
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
 from .exceptions import PdfConverterException
 
 
+def default_concurrency() -> int:
+    """Default number of chunks converted at once (PDF_CONVERTER_CONCURRENCY, else 5)."""
+    return int(os.getenv("PDF_CONVERTER_CONCURRENCY", "5"))
+
+
 @dataclass
 class ConversionConfig:
     """Configuration for PDF conversion."""
@@ -12,6 +20,34 @@ class ConversionConfig:
     max_retries: int = 3
     use_structured_messages: bool = True
     extract_text: bool = False
+    max_concurrent_llm_tasks: int = field(default_factory=default_concurrency)
+    use_batch_api: bool = False
+    batch_poll_interval: float = 30
+    return_full: bool = True
+    chunks_per_request: int = 1
+    content_key: Optional[str] = None
+    document_cache_key: Optional[str] = None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Get the tiktoken encoding for a model, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        # Not an OpenAI model name
+        encoding_name = "o200k_base"
+
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        # Encoding files could not be loaded (e.g. no network on first use)
+        return None
 
 
 class LLMProviderConfig:
@@ -20,16 +56,25 @@ class LLMProviderConfig:
     # Providers that support structured multimodal messages
     STRUCTURED_MESSAGE_SDKS = {"openai"}
 
+    # Providers whose models take several PDF chunks (content parts) in one request;
+    # only structured-message providers qualify, others get the chunks flattened to text
+    MULTI_CHUNK_PROVIDERS = {"openai", "openrouter"}
+
+    # Providers with an OpenAI-compatible batch endpoint (/v1/batches)
+    BATCH_API_PROVIDERS = {"openai"}
+
     # Default model configurations
     MODEL_CONFIGS = {
         "openai": {
             "model": "gpt-4o",
+            "context_tokens": 128_000,
             "package": "langchain_openai",
             "class": "ChatOpenAI",
             "sdk": "openai",
         },
         "openrouter": {
             "model": "nvidia/nemotron-3-nano-30b-a3b:free",
+            "context_tokens": 256_000,
             "package": "langchain_openai",
             "class": "ChatOpenAI",
             "sdk": "openai",
@@ -38,6 +83,7 @@ class LLMProviderConfig:
         },
         "groq": {
             "model": "llama-3.3-70b-versatile",
+            "context_tokens": 131_072,
             "package": "langchain_groq",
             "class": "ChatGroq",
             "sdk": "groq",
@@ -46,6 +92,7 @@ class LLMProviderConfig:
         },
         "google": {
             "model": "gemini-2.5-flash-lite",
+            "context_tokens": 1_048_576,
             "package": "langchain_google_genai",
             "class": "ChatGoogleGenerativeAI",
             "sdk": "google",
@@ -61,6 +108,34 @@ class LLMProviderConfig:
 
         return cls.MODEL_CONFIGS.get(llm_type).get("max_chunk_pages", default)
 
+    @classmethod
+    def get_context_tokens(cls, llm_type: str) -> Optional[int]:
+        """Get the context window size (in tokens) of the provider's model, if known."""
+        return cls.MODEL_CONFIGS.get(llm_type, {}).get("context_tokens")
+
+    @classmethod
+    def count_tokens(cls, llm_type: str, text: str) -> int:
+        """
+        Count the tokens in text for the provider's model.
+
+        Uses tiktoken when available (OpenAI's tokenizer is a close enough
+        approximation for the other providers), else estimates 4 chars per token.
+        """
+        encoding = _get_encoding(cls.MODEL_CONFIGS.get(llm_type, {}).get("model", ""))
+        if encoding is None:
+            return len(text) // 4
+        return len(encoding.encode(text, disallowed_special=()))
+
+    @classmethod
+    def supports_multi_chunk_requests(cls, llm_type: str) -> bool:
+        """Check if provider can convert several chunks in a single request."""
+        return llm_type.lower() in cls.MULTI_CHUNK_PROVIDERS and cls.supports_structured_messages(llm_type)
+
+    @classmethod
+    def supports_batch_api(cls, llm_type: str) -> bool:
+        """Check if provider supports submitting chunks as one batch job."""
+        return llm_type.lower() in cls.BATCH_API_PROVIDERS
+
     @classmethod
     def supports_structured_messages(cls, llm_type: str) -> bool:
         """Check if provider supports structured multimodal messages."""
@@ -68,8 +143,23 @@ class LLMProviderConfig:
                     if info.get("sdk") in cls.STRUCTURED_MESSAGE_SDKS]
         return llm_type.lower() in supports
 
+    _client_lock = threading.Lock()
+
     @classmethod
     def create_client(cls, llm_type: str, max_retries: int = 3, temperature: float = 0, timeout: int = 120):
+        """
+        Get the LLM client for the specified provider.
+
+        Clients are created once per (llm_type, max_retries, temperature, timeout)
+        and shared process-wide, along with their HTTP connection pools.
+        """
+        # lru_cache alone would let two threads build the same client at once
+        with cls._client_lock:
+            return cls._create_client(llm_type, max_retries, temperature, timeout)
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _create_client(cls, llm_type: str, max_retries: int, temperature: float, timeout: int):
         """Create an LLM client for the specified provider."""
         if llm_type not in cls.MODEL_CONFIGS:
             raise ValueError(f"Unknown llm_type: {llm_type}. Available: {list(cls.MODEL_CONFIGS.keys())}")
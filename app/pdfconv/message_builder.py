@@ -1,8 +1,39 @@
+from typing import List, Optional, Tuple
 from .exceptions import PdfConverterException
 import base64
+try:
+    import pybase64
+except ImportError:  # optional SIMD encoder, stdlib base64 is used otherwise
+    pybase64 = None
 from .utils import PdfUtils
 from .config import LLMProviderConfig
 
+# The conversion prompt only varies by chunk_info and by whether the header row
+# should be dropped, so the fixed parts are built once at import.
+_PROMPT_HEAD = "Attached is a spreadsheet in PDF"
+_PROMPT_TAIL = (
+    ". Convert it to CSV format. "
+    "Only return CSV, do not add any other additional text or response or annotation. Just the csv. "
+)
+_PROMPT_TAILS = {
+    False: _PROMPT_TAIL,
+    True: _PROMPT_TAIL + "Do not include the header row since this is a continuation of a previous chunk.",
+}
+
+
+_DATA_URL_PREFIX = "data:application/pdf;base64,"
+
+# Marks where each chunk starts, both in multi-chunk requests and in the responses
+CHUNK_MARKER = "<<<CHUNK {}>>>"
+
+
+def _b64encode(data: bytes) -> str:
+    """Base64-encode data to a str, with pybase64's SIMD encoder when installed."""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode('ascii')
+
+
 class MessageBuilder:
     """Builds LLM messages with proper formatting for different providers."""
 
@@ -13,13 +44,7 @@ class MessageBuilder:
         remove_header_if_not_first: bool = False
     ) -> str:
         """Build the conversion prompt."""
-        prompt = f"Attached is a spreadsheet in PDF{chunk_info}. Convert it to CSV format. "
-        prompt += "Only return CSV, do not add any other additional text or response or annotation. Just the csv. "
-
-        if remove_header_if_not_first and not is_first_chunk:
-            prompt += "Do not include the header row since this is a continuation of a previous chunk."
-
-        return prompt
+        return _PROMPT_HEAD + chunk_info + _PROMPT_TAILS[bool(remove_header_if_not_first and not is_first_chunk)]
 
     @staticmethod
     def build_message(
@@ -27,9 +52,10 @@ class MessageBuilder:
         chunk_data: bytes,
         llm_type: str,
         use_structured_messages: bool,
-        extract_text: bool
+        extract_text: bool,
+        extracted_text: Optional[str] = None
     ):
-        """Build a message for the LLM."""
+        """Build a message for the LLM, using extracted_text instead of the PDF when given."""
         try:
             from langchain_core.messages import HumanMessage
         except ImportError as e:
@@ -38,34 +64,80 @@ class MessageBuilder:
             ) from e
 
         # Extract text if requested
-        extracted_text = None
-        if extract_text:
+        if extract_text and extracted_text is None:
             extracted_text = PdfUtils.extract_text(chunk_data)
 
-        # Encode PDF as base64 if needed
-        pdf_base64 = None
-        if not extracted_text:
-            pdf_base64 = base64.b64encode(chunk_data).decode('utf-8')
+        structured = use_structured_messages and LLMProviderConfig.supports_structured_messages(llm_type)
+
+        # Text is available: send it and never touch base64
+        if extracted_text:
+            if structured:
+                return HumanMessage(content=[
+                    {"type": "text", "text": prompt},
+                    {"type": "text", "text": extracted_text},
+                ])
+            return HumanMessage(content="".join((prompt, "\n\nExtracted text:\n", extracted_text)))
+
+        # Otherwise attach the PDF itself as base64
+        pdf_base64 = _b64encode(chunk_data)
 
         # Build message based on provider capabilities
-        if use_structured_messages and LLMProviderConfig.supports_structured_messages(llm_type):
-            content = [{"type": "text", "text": prompt}]
+        if structured:
+            return HumanMessage(content=[
+                {"type": "text", "text": prompt},
+                {"type": "image_url", "image_url": {"url": _DATA_URL_PREFIX + pdf_base64}},
+            ])
+
+        # Fallback to single string message, joined in one pass so the
+        # (possibly multi-MB) payload is only copied once
+        return HumanMessage(content="".join((prompt, "\n\nAttached PDF (base64):\n", _DATA_URL_PREFIX, pdf_base64)))
 
+    @staticmethod
+    def build_multi_chunk_message(
+        chunks: List[Tuple[int, bytes, str]],
+        llm_type: str,
+        use_structured_messages: bool,
+        extract_text: bool,
+        remove_header_if_not_first: bool = False
+    ):
+        """
+        Build one message asking for several chunks to be converted at once.
+
+        Args:
+            chunks: (chunk number, PDF bytes, chunk_info) for each chunk, in order
+        """
+        try:
+            from langchain_core.messages import HumanMessage
+        except ImportError as e:
+            raise PdfConverterException(
+                "langchain_core is required but not installed. Install with: pip install langchain-core"
+            ) from e
+
+        prompt = (
+            f"Attached are {len(chunks)} consecutive parts of a spreadsheet in PDF, each introduced by a "
+            f"{CHUNK_MARKER.format('N')} line. Convert each part to CSV format. "
+            "Only return CSV, do not add any other additional text or response or annotation. "
+            "Write each part's marker line exactly as given, followed by that part's CSV."
+        )
+        structured = use_structured_messages and LLMProviderConfig.supports_structured_messages(llm_type)
+        content = [{"type": "text", "text": prompt}]
+
+        for number, chunk_data, chunk_info in chunks:
+            header = CHUNK_MARKER.format(number) + chunk_info
+            if remove_header_if_not_first and number > 1:
+                header += " Do not include the header row since this is a continuation of a previous chunk."
+            content.append({"type": "text", "text": header})
+
+            extracted_text = PdfUtils.extract_text(chunk_data) if extract_text else None
             if extracted_text:
                 content.append({"type": "text", "text": extracted_text})
             else:
-                content.append({
-                    "type": "image_url",
-                    "image_url": {"url": f"data:application/pdf;base64,{pdf_base64}"}
-                })
+                content.append({"type": "image_url", "image_url": {"url": _DATA_URL_PREFIX + _b64encode(chunk_data)}})
 
+        if structured:
             return HumanMessage(content=content)
-        else:
-            # Fallback to single string message
-            message_text = prompt
-            if extracted_text:
-                message_text += "\n\nExtracted text:\n" + extracted_text
-            else:
-                message_text += "\n\nAttached PDF (base64):\n" + f"data:application/pdf;base64,{pdf_base64}"
 
-            return HumanMessage(content=message_text)
+        # Fallback to single string message
+        return HumanMessage(content="\n\n".join(
+            part["text"] if part["type"] == "text" else part["image_url"]["url"] for part in content
+        ))
@@ -41,13 +41,13 @@ def main(argv=None):
 
     else:
         from app.pdfconv.basic import pdf_to_text, pdf_to_csv
+        from app.pdfconv.utils import PdfUtils
 
         # Read input bytes
         if args.input == "-":
             content = sys.stdin.buffer.read()
         else:
-            with open(args.input, "rb") as f:
-                content = f.read()
+            content = PdfUtils.read_pdf(args.input)
 
         # Text mode: extract and print all text
         if args.format == "text":
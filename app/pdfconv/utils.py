@@ -1,7 +1,55 @@
-from typing import Optional, List
+from typing import BinaryIO, Iterator, Optional, List, Union
+from .cache import ChunkCache
 from .exceptions import PdfConverterException
 from dataclasses import dataclass
 import io
+import os
+import re
+import threading
+
+# Buffer size for incrementally written output: written back once per MiB, not once per chunk
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+
+def _iov_max() -> int:
+    """Most buffers a single writev call accepts (1024 when the platform can't say)."""
+    try:
+        iov_max = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+    # -1 means indeterminate
+    return iov_max if iov_max > 0 else 1024
+
+
+_IOV_MAX = _iov_max()
+
+# A PDF given either as a file path or as its raw bytes
+PdfSource = Union[str, bytes]
+
+_PyPDF2 = None
+_pdfium_lock = threading.Lock()
+
+
+def _pypdf2():
+    """Import PyPDF2 on first use and keep the module for later calls."""
+    global _PyPDF2
+    if _PyPDF2 is None:
+        try:
+            import PyPDF2
+        except ImportError as e:
+            raise PdfConverterException(
+                "PyPDF2 is required to read PDFs but is not installed. Install with: pip install PyPDF2"
+            ) from e
+        _PyPDF2 = PyPDF2
+    return _PyPDF2
+
+
+_RE_CHUNK_MARKER = re.compile(r"<<<CHUNK (\d+)>>>")
+
+# Page counts and splits keyed by PDF content hash, so a PDF is parsed once per run;
+# splits hold a copy of every page, so the cache is bounded by their total size
+PDF_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_pdf_cache = ChunkCache(max_entries=8, ttl=3600, max_bytes=PDF_CACHE_MAX_BYTES)
 
 @dataclass
 class PdfChunk:
@@ -21,72 +69,193 @@ class PdfUtils:
     """Utilities for PDF manipulation."""
 
     @staticmethod
-    def get_page_count(pdf_path: str) -> int:
+    def read_pdf(pdf: PdfSource) -> bytes:
+        """Return the PDF contents, reading the file if given a path."""
+        if isinstance(pdf, (bytes, bytearray)):
+            return bytes(pdf)
+        # Unbuffered: readall() sizes one buffer from fstat and fills it with
+        # a few large reads, with no copy through an 8 KiB BufferedReader
+        with open(pdf, "rb", buffering=0) as f:
+            return f.readall()
+
+    @staticmethod
+    def content_key(pdf_data: bytes) -> str:
+        """Hash the PDF contents once, for the content_key argument of the methods below."""
+        return ChunkCache.make_key(pdf_data)
+
+    @staticmethod
+    def get_page_count(pdf: PdfSource, content_key: Optional[str] = None) -> int:
         """Get the number of pages in a PDF."""
-        try:
-            import PyPDF2
-        except ImportError as e:
-            raise PdfConverterException(
-                "PyPDF2 is required to read PDFs but is not installed. Install with: pip install PyPDF2"
-            ) from e
+        PyPDF2 = _pypdf2()
+        pdf_data = PdfUtils.read_pdf(pdf)
+        cache_key = ChunkCache.derive_key(content_key or PdfUtils.content_key(pdf_data), "pages")
+        page_count = _pdf_cache.get(cache_key)
+        if page_count is None:
+            page_count = len(PyPDF2.PdfReader(io.BytesIO(pdf_data)).pages)
+            _pdf_cache.set(cache_key, page_count)
+        return page_count
 
-        with open(pdf_path, "rb") as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            return len(pdf_reader.pages)
+    @staticmethod
+    def split_into_chunks(
+        pdf: PdfSource, pages_per_chunk: int = 10, content_key: Optional[str] = None
+    ) -> List[PdfChunk]:
+        """Split a PDF into smaller chunks, using pikepdf when installed and PyPDF2 otherwise."""
+        pdf_data = PdfUtils.read_pdf(pdf)
+        content_key = content_key or PdfUtils.content_key(pdf_data)
+        cached = _pdf_cache.get(ChunkCache.derive_key(content_key, "split", pages_per_chunk))
+        if cached is not None:
+            return cached
+        return list(PdfUtils.iter_chunks(pdf_data, pages_per_chunk, content_key=content_key))
 
     @staticmethod
-    def split_into_chunks(pdf_path: str, pages_per_chunk: int = 10) -> List[PdfChunk]:
-        """Split a PDF into smaller chunks."""
-        try:
-            import PyPDF2
-        except ImportError as e:
-            raise PdfConverterException(
-                "PyPDF2 is required to chunk PDFs but is not installed. Install with: pip install PyPDF2"
-            ) from e
+    def iter_chunks(
+        pdf: PdfSource, pages_per_chunk: int = 10, cache: bool = True, content_key: Optional[str] = None
+    ) -> Iterator[PdfChunk]:
+        """
+        Lazily split a PDF into chunks, so callers can start on the first chunk
+        while the rest are still being split.
+
+        With cache=True, a fully consumed split is cached for split_into_chunks
+        and later calls; pass cache=False to keep only one chunk in memory.
+        """
+        pdf_data = PdfUtils.read_pdf(pdf)
+        if not cache:
+            yield from PdfUtils._iter_split(pdf_data, pages_per_chunk)
+            return
+
+        cache_key = ChunkCache.derive_key(content_key or PdfUtils.content_key(pdf_data), "split", pages_per_chunk)
+        cached = _pdf_cache.get(cache_key)
+        if cached is not None:
+            yield from cached
+            return
 
         chunks = []
-        with open(pdf_path, "rb") as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            total_pages = len(pdf_reader.pages)
+        for chunk in PdfUtils._iter_split(pdf_data, pages_per_chunk):
+            chunks.append(chunk)
+            yield chunk
+        _pdf_cache.set(cache_key, chunks, size=sum(len(chunk.data) for chunk in chunks))
 
-            for start_page in range(0, total_pages, pages_per_chunk):
-                end_page = min(start_page + pages_per_chunk, total_pages)
-                pdf_writer = PyPDF2.PdfWriter()
+    @staticmethod
+    def _iter_split(pdf_data: bytes, pages_per_chunk: int) -> Iterator[PdfChunk]:
+        """Split with pikepdf when installed, else PyPDF2."""
+        try:
+            import pikepdf
+        except ImportError:
+            return PdfUtils._iter_with_pypdf2(pdf_data, pages_per_chunk)
+        return PdfUtils._iter_with_pikepdf(pikepdf, pdf_data, pages_per_chunk)
 
-                for page_num in range(start_page, end_page):
-                    pdf_writer.add_page(pdf_reader.pages[page_num])
+    @staticmethod
+    def _iter_with_pikepdf(pikepdf, pdf_data: bytes, pages_per_chunk: int) -> Iterator[PdfChunk]:
+        """Split with pikepdf (QPDF), which copies page objects without re-parsing their content."""
+        with pikepdf.open(io.BytesIO(pdf_data)) as source:
+            pages = source.pages
+            total_pages = len(pages)
 
-                chunk_bytes = io.BytesIO()
-                pdf_writer.write(chunk_bytes)
-                chunk_bytes.seek(0)
+            for start_page in range(0, total_pages, pages_per_chunk):
+                end_page = min(start_page + pages_per_chunk, total_pages)
+                with pikepdf.new() as target:
+                    target.pages.extend(pages[start_page:end_page])
+                    chunk_bytes = io.BytesIO()
+                    target.save(chunk_bytes)
 
-                chunks.append(PdfChunk(
-                    data=chunk_bytes.read(),
+                yield PdfChunk(
+                    data=chunk_bytes.getvalue(),
                     start_page=start_page + 1,
                     end_page=end_page,
                     total_pages=total_pages
-                ))
+                )
+
+    @staticmethod
+    def _iter_with_pypdf2(pdf_data: bytes, pages_per_chunk: int) -> Iterator[PdfChunk]:
+        """Split with PyPDF2's writer."""
+        PyPDF2 = _pypdf2()
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_data), strict=False)
+        # Look up the page list once instead of on every page access
+        pages = pdf_reader.pages
+        total_pages = len(pages)
+
+        for start_page in range(0, total_pages, pages_per_chunk):
+            end_page = min(start_page + pages_per_chunk, total_pages)
+            pdf_writer = PyPDF2.PdfWriter()
 
-        return chunks
+            for page_num in range(start_page, end_page):
+                pdf_writer.add_page(pages[page_num])
+
+            chunk_bytes = io.BytesIO()
+            pdf_writer.write(chunk_bytes)
+
+            yield PdfChunk(
+                data=chunk_bytes.getvalue(),
+                start_page=start_page + 1,
+                end_page=end_page,
+                total_pages=total_pages
+            )
 
     @staticmethod
     def extract_text(pdf_data: bytes) -> Optional[str]:
-        """Extract text from PDF bytes."""
+        """
+        Extract text from PDF bytes, using pypdfium2 (PDFium) when installed and PyPDF2 otherwise.
+
+        Returns None if the first page has no text layer (e.g. a scanned PDF),
+        without extracting the remaining pages.
+        """
+        pages_text = None
         try:
-            import PyPDF2
-            reader = PyPDF2.PdfReader(io.BytesIO(pdf_data))
-            pages_text = []
-            for page in reader.pages:
-                try:
-                    text = page.extract_text() or ""
-                except Exception:
-                    text = ""
-                if text:
-                    pages_text.append(text)
-            return "\n".join(pages_text).strip() if pages_text else None
+            import pypdfium2
+        except ImportError:
+            pass
+        else:
+            try:
+                pages_text = PdfUtils._extract_pages_pdfium(pypdfium2, pdf_data)
+            except Exception:
+                # Fall back to PyPDF2 for anything PDFium can't read
+                pages_text = None
+
+        try:
+            if pages_text is None:
+                pages_text = PdfUtils._extract_pages_pypdf2(pdf_data)
         except Exception:
             return None
 
+        return "\n".join(text for text in pages_text if text).strip() or None
+
+    @staticmethod
+    def _extract_pages_pdfium(pypdfium2, pdf_data: bytes) -> List[str]:
+        """Extract each page's text with PDFium, stopping if the first page has none."""
+        pages_text = []
+        # PDFium is not thread-safe, and chunks are converted from several threads
+        with _pdfium_lock:
+            pdf = pypdfium2.PdfDocument(pdf_data)
+            try:
+                for i, page in enumerate(pdf):
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_range().replace("\r\n", "\n")
+                    finally:
+                        textpage.close()
+                        page.close()
+                    if not text.strip() and i == 0:
+                        return []
+                    pages_text.append(text)
+            finally:
+                pdf.close()
+        return pages_text
+
+    @staticmethod
+    def _extract_pages_pypdf2(pdf_data: bytes) -> List[str]:
+        """Extract each page's text with PyPDF2, stopping if the first page has none."""
+        reader = _pypdf2().PdfReader(io.BytesIO(pdf_data))
+        pages_text = []
+        for i, page in enumerate(reader.pages):
+            try:
+                text = page.extract_text() or ""
+            except Exception:
+                text = ""
+            if not text and i == 0:
+                return []
+            pages_text.append(text)
+        return pages_text
+
 
 class CsvProcessor:
     """Utilities for processing CSV output."""
@@ -97,20 +266,42 @@ class CsvProcessor:
         if not response_content:
             raise ValueError("LLM returned empty response")
 
-        # Remove markdown code blocks
-        result = response_content.replace('```csv', '').replace('```', '').strip()
+        # Remove the markdown code fence; it only ever wraps the whole response,
+        # so check the ends instead of scanning the full text for it
+        result = response_content.strip()
+        if result.startswith('```csv'):
+            result = result[6:]
+        elif result.startswith('```'):
+            result = result[3:]
+        if result.endswith('```'):
+            result = result[:-3]
+        result = result.strip()
 
         if not result:
             raise ValueError("LLM returned empty CSV after cleaning")
 
         return result
 
+    @staticmethod
+    def split_multi_chunk_response(response_content: str, chunk_numbers: List[int]) -> List[str]:
+        """Split a multi-chunk response on its <<<CHUNK n>>> markers and clean each part."""
+        # re.split with a group gives [preamble, n1, body1, n2, body2, ...]
+        parts = _RE_CHUNK_MARKER.split(response_content or "")
+        bodies = dict(zip((int(n) for n in parts[1::2]), parts[2::2]))
+
+        missing = [n for n in chunk_numbers if n not in bodies]
+        if missing:
+            raise ValueError(f"LLM response is missing chunk(s) {missing}")
+
+        return [CsvProcessor.clean_response(bodies[n]) for n in chunk_numbers]
+
     @staticmethod
     def remove_header(csv_content: str) -> str:
         """Remove the header row from CSV content."""
-        lines = csv_content.split('\n')
-        if len(lines) > 1:
-            return '\n'.join(lines[1:])
+        # Slice past the first newline instead of splitting every line
+        newline = csv_content.find('\n')
+        if newline != -1:
+            return csv_content[newline + 1:]
         return csv_content
 
 
@@ -127,6 +318,81 @@ class FileManager:
         except Exception as e:
             print(f"❌ Failed to save {description} to {filename}: {str(e)}")
 
+    @staticmethod
+    def open_output(filename: Optional[str], description: str = "output file") -> Optional[BinaryIO]:
+        """Open a file for incremental binary writes, or return None if it can't be opened."""
+        if not filename:
+            return None
+
+        try:
+            return open(filename, 'wb', buffering=OUTPUT_BUFFER_SIZE)
+        except Exception as e:
+            print(f"❌ Failed to open {description}: {str(e)}")
+            return None
+
+    @staticmethod
+    def commit_output(output_file: BinaryIO, temp_filename: str, filename: str, description: str = "output"):
+        """Close a temporary output file and move it into place at filename."""
+        try:
+            output_file.close()
+            os.replace(temp_filename, filename)
+            print(f"✓ Saved {description} to {filename}")
+        except Exception as e:
+            print(f"❌ Failed to save {description} to {filename}: {str(e)}")
+            FileManager.discard_output(output_file, temp_filename)
+
+    @staticmethod
+    def discard_output(output_file: BinaryIO, temp_filename: str):
+        """Close and delete a temporary output file that won't be completed."""
+        try:
+            output_file.close()
+        except Exception:
+            pass
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+
+    @staticmethod
+    def save_chunks(csv_data_list: List[str], filename: str, description: str = "output"):
+        """Save CSV chunks joined by newlines, without building the joined string."""
+        buffers = []
+        for i, csv_data in enumerate(csv_data_list):
+            if i > 0:
+                buffers.append(b'\n')
+            buffers.append(csv_data.encode('utf-8'))
+
+        try:
+            with open(filename, 'wb', buffering=0) as f:
+                FileManager._write_buffers(f, buffers)
+            print(f"✓ Saved {description} to {filename}")
+        except Exception as e:
+            print(f"❌ Failed to save {description} to {filename}: {str(e)}")
+
+    @staticmethod
+    def _write_buffers(f: BinaryIO, buffers: List[bytes]):
+        """Write buffers in order, handing the kernel up to IOV_MAX at a time with writev."""
+        if not hasattr(os, "writev"):
+            f.writelines(buffers)
+            return
+
+        fd = f.fileno()
+        pending = [memoryview(b) for b in buffers if b]
+        start = 0
+        while start < len(pending):
+            written = os.writev(fd, pending[start:start + _IOV_MAX])
+            if written == 0:
+                raise OSError("writev wrote no bytes")
+            # writev may stop early: skip the buffers it finished, trim the one it was in
+            while written and start < len(pending):
+                size = len(pending[start])
+                if written >= size:
+                    written -= size
+                    start += 1
+                else:
+                    pending[start] = pending[start][written:]
+                    written = 0
+
     @staticmethod
     def save_partial_results(csv_data_list: List[str], output_filename: Optional[str], chunk_index: int):
         """Save partial results when an error occurs."""
@@ -135,8 +401,8 @@ class FileManager:
 
         try:
             partial_filename = f"{output_filename}.partial_{chunk_index}"
-            FileManager.save_to_file(
-                '\n'.join(csv_data_list),
+            FileManager.save_chunks(
+                csv_data_list,
                 partial_filename,
                 f"partial results (up to chunk {chunk_index})"
             )
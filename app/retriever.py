@@ -1,8 +1,11 @@
+import functools
+
 from langchain.embeddings import OpenAIEmbeddings
-from langchain_community.vectorstores import FAISS
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import WebBaseLoader
 
+from app.vectorstore import load_vectorstore
+
 
 def get_doc_loader(file_path: str):
     loader = TextLoader(file_path=file_path)
@@ -16,7 +19,9 @@ def get_web_loader(url: str):
     return webdocs
 
 
+@functools.lru_cache(maxsize=1)
 def get_retriever():
+    # Load the index and embeddings client once; later calls reuse them
     embeddings = OpenAIEmbeddings()
-    db = FAISS.load_local("vectorstore", embeddings)
+    db = load_vectorstore(embeddings, "vectorstore")
     return db.as_retriever()
@@ -1,11 +1,79 @@
+import ast
+import functools
+import math
+
 from langchain.tools import tool
 
+# Integer functions whose cost grows with the size of their argument
+_UNBOUNDED_FUNCS = {"factorial", "comb", "perm"}
+
+# Names an expression may use: the math module's public functions and constants
+MATH_NS = {
+    name: getattr(math, name) for name in dir(math)
+    if not name.startswith("_") and name not in _UNBOUNDED_FUNCS
+}
+MATH_NS.update(abs=abs, round=round, min=min, max=max)
+
+# Bounds that keep a single expression from running for minutes
+MAX_EXPONENT = 100
+MAX_INT_CONSTANT = 10 ** 18
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+)
+
+
+def _constant_exponent(node: ast.AST):
+    """Return the value of a (possibly signed) numeric constant, or None."""
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        value = _constant_exponent(node.operand)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    return None
+
+
+def _validate(tree: ast.AST):
+    """Reject anything but bounded arithmetic on numbers and calls to MATH_NS functions."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ValueError(f"unsupported constant: {node.value!r}")
+        if isinstance(node, ast.Constant) and isinstance(node.value, int) and abs(node.value) > MAX_INT_CONSTANT:
+            raise ValueError(f"integer constant too large: {node.value}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            # Only small literal exponents, and no power towers through the base
+            exponent = _constant_exponent(node.right)
+            if exponent is None or abs(exponent) > MAX_EXPONENT:
+                raise ValueError(f"exponent must be a number between -{MAX_EXPONENT} and {MAX_EXPONENT}")
+            if any(isinstance(inner.op, ast.Pow) for inner in ast.walk(node.left) if isinstance(inner, ast.BinOp)):
+                raise ValueError("nested powers are not allowed")
+        if isinstance(node, ast.Name) and node.id not in MATH_NS:
+            raise ValueError(f"unknown name: {node.id}")
+        if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.keywords):
+            raise ValueError("only plain calls to math functions are allowed")
+        if isinstance(node, ast.Call) and node.func.id == "round" and len(node.args) > 1:
+            # round(x, -n) computes 10 ** n internally, so bound ndigits like an exponent
+            ndigits = _constant_exponent(node.args[1])
+            if ndigits is None or abs(ndigits) > MAX_EXPONENT:
+                raise ValueError(f"round() digits must be a number between -{MAX_EXPONENT} and {MAX_EXPONENT}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(expression: str):
+    """Parse, validate and compile an expression once; repeated expressions reuse the code object."""
+    tree = ast.parse(expression.strip(), mode="eval")
+    _validate(tree)
+    return compile(tree, "<calculator>", "eval")
+
+
 @tool
 def calculator(expression: str):
     """Evaluate mathematical expressions"""
-    # One of those cases of a tool that does everything!
     try:
-        return str(eval(expression))  # Very bad!!! No guardrails.
+        return str(eval(_compile(expression), {"__builtins__": {}}, MATH_NS))
     except Exception as e:
         return f"Error: {e}"
 
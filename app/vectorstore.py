@@ -0,0 +1,102 @@
+import json
+import os
+import uuid
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+INDEX_FILE = "index.faiss"
+DOCSTORE_FILE = "docstore.jsonl"
+
+# Memory-map the index file instead of reading it into the heap, so startup is
+# near-instant and several workers share the same pages.
+_MMAP_FLAGS = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+
+# Below this many vectors an exact flat scan is fast enough and needs no training
+IVF_MIN_VECTORS = 100_000
+IVF_NPROBE = 16
+PQ_MAX_SUBQUANTIZERS = 64
+
+
+def build_index(vectors: np.ndarray) -> faiss.Index:
+    """
+    Build and fill a FAISS index for the given float32 vectors.
+
+    Small corpora use an exact IndexFlatL2. Large ones use IndexIVFPQ, which
+    probes a few inverted lists of product-quantized codes instead of scanning
+    every full-precision vector.
+    """
+    n, d = vectors.shape
+    if n < IVF_MIN_VECTORS:
+        index = faiss.IndexFlatL2(d)
+    else:
+        nlist = min(4096, 4 * int(n ** 0.5))
+        # PQ needs the dimension to split evenly into sub-quantizers
+        m = max(k for k in range(1, PQ_MAX_SUBQUANTIZERS + 1) if d % k == 0)
+        index = faiss.IndexIVFPQ(faiss.IndexFlatL2(d), d, nlist, m, 8)
+        index.train(vectors)
+        index.nprobe = IVF_NPROBE
+
+    index.add(vectors)
+    return index
+
+
+def build_vectorstore(texts, vectors, embeddings, metadatas=None) -> FAISS:
+    """Create a FAISS vector store from precomputed embeddings, choosing the index type by size."""
+    index = build_index(np.asarray(vectors, dtype="float32"))
+
+    ids = [str(uuid.uuid4()) for _ in texts]
+    metadatas = metadatas or [{} for _ in texts]
+    docs = {
+        doc_id: Document(page_content=text, metadata=metadata)
+        for doc_id, text, metadata in zip(ids, texts, metadatas)
+    }
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(docs),
+        index_to_docstore_id=dict(enumerate(ids))
+    )
+
+
+def save_vectorstore(vectorstore: FAISS, path: str = "vectorstore"):
+    """Save the raw FAISS index plus a JSONL docstore (one line per vector, in index order)."""
+    os.makedirs(path, exist_ok=True)
+    faiss.write_index(vectorstore.index, os.path.join(path, INDEX_FILE))
+
+    with open(os.path.join(path, DOCSTORE_FILE), "w", encoding="utf-8") as f:
+        for position in range(vectorstore.index.ntotal):
+            doc_id = vectorstore.index_to_docstore_id[position]
+            doc = vectorstore.docstore.search(doc_id)
+            f.write(json.dumps({
+                "id": doc_id,
+                "page_content": doc.page_content,
+                "metadata": doc.metadata,
+            }) + "\n")
+
+
+def load_vectorstore(embeddings, path: str = "vectorstore") -> FAISS:
+    """Load a vector store written by save_vectorstore, memory-mapping the index."""
+    index = faiss.read_index(os.path.join(path, INDEX_FILE), _MMAP_FLAGS)
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = IVF_NPROBE
+
+    docs = {}
+    index_to_docstore_id = {}
+    with open(os.path.join(path, DOCSTORE_FILE), encoding="utf-8") as f:
+        for position, line in enumerate(f):
+            record = json.loads(line)
+            docs[record["id"]] = Document(page_content=record["page_content"], metadata=record["metadata"])
+            index_to_docstore_id[position] = record["id"]
+
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(docs),
+        index_to_docstore_id=index_to_docstore_id
+    )
@@ -19,46 +19,57 @@ class MockRunnable(Runnable):
     def __init__(self, name="mock"):
         super().__init__()
         self.name = name
+        self._resp = f"mock response from {name}"
     
     def invoke(self, input_data, config=None):
-        return {"output": f"mock response from {self.name}", "input": input_data}
+        return {"output": self._resp, "input": input_data}
     
     def batch(self, inputs, config=None, **kwargs):
-        return [self.invoke(inp, config) for inp in inputs]
+        return [{"output": self._resp, "input": inp} for inp in inputs]
     
     async def ainvoke(self, input_data, config=None):
         return self.invoke(input_data, config)
     
     async def abatch(self, inputs, config=None, **kwargs):
-        return [self.invoke(inp, config) for inp in inputs]
+        return self.batch(inputs, config)
+
+
+class MockTool:
+    """A real Tool-like class that can be used with the mocked langchain.tools."""
+
+    def __init__(self, name=None, func=None, description=None):
+        self.name = name
+        self.func = func
+        self.description = description
+
+
+# Mock modules for all langchain submodules, built once at import so
+# re-collections and xdist workers reuse the same objects
+_MOCK_MODULES = {
+    name: MagicMock()
+    for name in (
+        'langchain',
+        'langchain.agents',
+        'langchain.chains',
+        'langchain.chat_models',
+        'langchain.memory',
+        'langchain.tools',
+        'langchain.embeddings',
+        'langchain.vectorstores',
+    )
+}
+_MOCK_MODULES['langchain.tools'].Tool = MockTool
+# @tool wraps a function in a MockTool named after it, described by its docstring
+_MOCK_MODULES['langchain.tools'].tool = lambda func: MockTool(
+    name=func.__name__, func=func, description=func.__doc__
+)
 
 
 def pytest_configure(config):
     """Mock langchain modules before any imports."""
-    # Create a real Tool-like class that can be used with mocks
-    class MockTool:
-        def __init__(self, name=None, func=None, description=None):
-            self.name = name
-            self.func = func
-            self.description = description
-    
-    # Create mock modules for all langchain submodules
-    mock_modules = {
-        'langchain': MagicMock(),
-        'langchain.agents': MagicMock(),
-        'langchain.chains': MagicMock(),
-        'langchain.chat_models': MagicMock(),
-        'langchain.memory': MagicMock(),
-        'langchain.tools': MagicMock(),
-        'langchain.embeddings': MagicMock(),
-        'langchain.vectorstores': MagicMock(),
-    }
-    
-    # Add the Tool class to the langchain.tools mock
-    mock_modules['langchain.tools'].Tool = MockTool
-    
-    for module_name, mock_module in mock_modules.items():
-        sys.modules[module_name] = mock_module
+    sys.modules.update({
+        name: module for name, module in _MOCK_MODULES.items() if name not in sys.modules
+    })
 
 
 @pytest.fixture(autouse=True)
@@ -69,33 +80,67 @@ def mock_dotenv():
 
 
 @pytest.fixture
+def clear_retriever_cache():
+    """Clear the memoized retriever so each test loads its own (mocked) one."""
+    from app.retriever import get_retriever
+    get_retriever.cache_clear()
+    yield
+    get_retriever.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def mock_all_factories():
+    """Replace the agent and RAG chain factories with MockRunnables for the app's routes."""
+    with patch('app.agent.get_agent', return_value=MockRunnable("agent")), \
+            patch('app.chains.get_rag_chain', return_value=MockRunnable("rag")):
+        yield
+
+
+@pytest.fixture(scope="session")
+def client(mock_all_factories):
+    """Create one test client for the FastAPI app, running its lifespan once per session."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def openapi_schema(client):
+    """Fetch and parse the app's OpenAPI schema once per session."""
+    response = client.get("/openapi.json")
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.fixture(scope="session")
+def tools_list():
+    """Build the agent's tools once per session."""
+    from app.tools import get_tools
+    return get_tools()
+
+
+@pytest.fixture(scope="session")
+def tool_names(tools_list):
+    """Names of the agent's tools, in order."""
+    return [t.name for t in tools_list]
+
+
+@pytest.fixture(scope="module")
 def mock_openai_embeddings():
-    """Mock OpenAI embeddings to avoid API calls."""
+    """Mock OpenAI embeddings to avoid API calls (shared by a module; reset_mock() between tests)."""
     with patch('app.retriever.OpenAIEmbeddings') as mock:
         yield mock
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_faiss():
-    """Mock FAISS to avoid loading vector store."""
-    with patch('app.retriever.FAISS') as mock:
-        # Mock the load_local and as_retriever chain
+    """Mock the FAISS vector store loader to avoid loading vector store (shared by a module)."""
+    with patch('app.retriever.load_vectorstore') as mock:
+        # Mock the loaded store and its as_retriever chain
         mock_faiss_instance = MagicMock()
-        mock_retriever = MagicMock()
+        mock_retriever = object()
         mock_faiss_instance.as_retriever.return_value = mock_retriever
-        mock.load_local.return_value = mock_faiss_instance
+        mock.return_value = mock_faiss_instance
         yield mock
 
-
-@pytest.fixture
-def mock_chat_openai():
-    """Mock ChatOpenAI to avoid API calls."""
-    with patch('app.llm.ChatOpenAI') as mock:
-        yield mock
-
-
-@pytest.fixture
-def mock_retrieval_qa():
-    """Mock RetrievalQA to avoid complex initialization."""
-    with patch('app.chains.RetrievalQA') as mock:
-        yield mock
@@ -0,0 +1,41 @@
+"""
+Micro-benchmarks for the factory functions and message building.
+
+Disabled in normal runs (each benchmarked call runs once, as a plain test).
+Run them with: pytest --benchmark-enable --benchmark-only
+"""
+
+import pytest
+from unittest.mock import patch
+from app.chains import get_rag_chain
+from app.pdfconv.message_builder import MessageBuilder
+from app.retriever import get_retriever
+
+
+@pytest.mark.parametrize("chunk_size", [1024, 256 * 1024, 4 * 1024 * 1024])
+def test_bench_build_message(benchmark, chunk_size):
+    """Benchmark building a base64 PDF message for different chunk sizes."""
+    chunk_data = b"%PDF-" + b"\0" * chunk_size
+    message = benchmark(
+        MessageBuilder.build_message,
+        prompt="x",
+        chunk_data=chunk_data,
+        llm_type="openai",
+        use_structured_messages=False,
+        extract_text=False,
+    )
+    assert message.content.startswith("x")
+
+
+def test_bench_get_retriever(benchmark, mock_openai_embeddings, mock_faiss):
+    """Benchmark an uncached get_retriever call with mocked embeddings and FAISS."""
+    result = benchmark(get_retriever.__wrapped__)
+    assert result == mock_faiss.return_value.as_retriever.return_value
+
+
+def test_bench_get_rag_chain(benchmark):
+    """Benchmark get_rag_chain with its dependencies mocked."""
+    with patch('app.chains.RetrievalQA') as mock_retrieval_qa, \
+            patch('app.chains.get_llm'), patch('app.chains.get_retriever'):
+        result = benchmark(get_rag_chain)
+    assert result == mock_retrieval_qa.from_chain_type.return_value
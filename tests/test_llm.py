@@ -13,4 +13,21 @@ class TestGetLLM:
 
     def test_get_llm(self):
         result = get_llm()
-        assert result is not None
\ No newline at end of file
+        assert result is not None
+
+    async def test_aclose_llm_closes_http_clients(self):
+        """Test that aclose_llm closes the LLM's HTTP clients and drops the cached LLM."""
+        from app.llm import aclose_llm, _http_clients
+
+        with patch('app.llm.ChatOpenAI') as mock_chat:
+            get_llm.cache_clear()
+            get_llm()
+            clients = list(_http_clients)
+            await aclose_llm()
+
+            assert len(clients) == 2
+            assert all(client.is_closed for client in clients)
+            assert _http_clients == []
+            get_llm()
+            assert mock_chat.call_count == 2
+            await aclose_llm()
@@ -4,17 +4,10 @@ Tests for the main FastAPI application endpoints.
 
 import pytest
 from unittest.mock import patch
-from fastapi.testclient import TestClient
+from app.main import app
 from tests.conftest import MockRunnable
 
 
-@pytest.fixture
-def client(mock_all_factories):
-    """Create a test client for the FastAPI app."""
-    from app.main import app
-    return TestClient(app)
-
-
 class TestRootEndpoint:
     """Tests for the root endpoint."""
 
@@ -39,38 +32,25 @@ class TestRootEndpoint:
 class TestAgentEndpoints:
     """Tests for the agent endpoints."""
 
-    def test_agent_invoke_endpoint_exists(self, client):
+    def test_agent_invoke_endpoint_exists(self, openapi_schema):
         """Test that the agent invoke endpoint is available."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        openapi_schema = response.json()
         assert "/agent/invoke" in openapi_schema.get("paths", {})
 
-    def test_agent_endpoints_are_registered(self, client):
+    def test_agent_endpoints_are_registered(self, openapi_schema):
         """Test that agent endpoints are properly registered via add_routes."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        openapi_schema = response.json()
-        
         # Check that agent routes exist
         paths = openapi_schema.get("paths", {})
-        agent_paths = [p for p in paths.keys() if "/agent" in p]
-        assert len(agent_paths) > 0, "No agent endpoints found in OpenAPI schema"
+        assert any(p.startswith("/agent") for p in paths), "No agent endpoints found in OpenAPI schema"
 
 
 class TestRAGEndpoints:
     """Tests for the RAG chain endpoints."""
 
-    def test_rag_endpoints_are_registered(self, client):
+    def test_rag_endpoints_are_registered(self, openapi_schema):
         """Test that RAG endpoints are properly registered via add_routes."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        openapi_schema = response.json()
-        
         # Check that rag routes exist
         paths = openapi_schema.get("paths", {})
-        rag_paths = [p for p in paths.keys() if "/rag" in p]
-        assert len(rag_paths) > 0, "No RAG endpoints found in OpenAPI schema"
+        assert any(p.startswith("/rag") for p in paths), "No RAG endpoints found in OpenAPI schema"
 
 
 class TestAppMetadata:
@@ -86,14 +66,11 @@ class TestAppMetadata:
         from app.main import app
         assert app.version == "1.0"
 
-    def test_openapi_schema_accessible(self, client):
+    def test_openapi_schema_accessible(self, openapi_schema):
         """Test that the OpenAPI schema is accessible."""
-        response = client.get("/openapi.json")
-        assert response.status_code == 200
-        schema = response.json()
-        assert "info" in schema
-        assert schema["info"]["title"] == "Agentic AI Backend"
-        assert schema["info"]["version"] == "1.0"
+        assert "info" in openapi_schema
+        assert openapi_schema["info"]["title"] == "Agentic AI Backend"
+        assert openapi_schema["info"]["version"] == "1.0"
 
     def test_docs_endpoint_accessible(self, client):
         """Test that the Swagger UI docs endpoint is accessible."""
@@ -105,22 +82,12 @@ class TestAppMetadata:
 class TestHTTPMethods:
     """Tests for HTTP method handling."""
 
-    def test_root_endpoint_only_accepts_get(self, client):
+    @pytest.mark.parametrize("method", ["post", "put", "delete", "patch"])
+    def test_root_endpoint_rejects_method(self, client, method):
         """Test that the root endpoint only accepts GET requests."""
-        # POST should not be allowed
-        response = client.post("/")
+        response = client.request(method, "/")
         assert response.status_code == 405  # Method Not Allowed
 
-    def test_root_endpoint_does_not_accept_put(self, client):
-        """Test that the root endpoint does not accept PUT requests."""
-        response = client.put("/")
-        assert response.status_code == 405
-
-    def test_root_endpoint_does_not_accept_delete(self, client):
-        """Test that the root endpoint does not accept DELETE requests."""
-        response = client.delete("/")
-        assert response.status_code == 405
-
 
 class TestApplicationStartup:
     """Tests for application startup and initialization."""
@@ -131,22 +98,49 @@ class TestApplicationStartup:
         assert hasattr(app, "routes")
         assert len(app.routes) > 0
 
-    def test_app_has_openapi_endpoints(self, client):
+    # These are standard FastAPI endpoints
+    @pytest.mark.parametrize("endpoint", ["/openapi.json", "/docs", "/redoc"])
+    def test_app_has_openapi_endpoints(self, client, endpoint):
         """Test that the app has OpenAPI-related endpoints."""
-        # These are standard FastAPI endpoints
-        endpoints_to_test = ["/openapi.json", "/docs", "/redoc"]
-        for endpoint in endpoints_to_test:
-            response = client.get(endpoint)
-            # These should either return 200 or 307 (redirect)
-            assert response.status_code in [200, 307]
-
-    def test_langserve_routes_added(self):
+        response = client.get(endpoint)
+        # These should either return 200 or 307 (redirect)
+        assert response.status_code in [200, 307]
+
+    def test_langserve_routes_added(self, client):
         """Test that langserve routes were added to the app."""
-        route_paths = {route.path for route in app.routes}
+        route_paths = [route.path for route in app.routes]
         
         # Check that agent and rag routes exist
-        agent_routes = {p for p in route_paths if "/agent" in p}
-        rag_routes = {p for p in route_paths if "/rag" in p}
-        
-        assert len(agent_routes) > 0, "No agent routes found"
-        assert len(rag_routes) > 0, "No rag routes found"
+        assert any(p.startswith("/agent") for p in route_paths), "No agent routes found"
+        assert any(p.startswith("/rag") for p in route_paths), "No rag routes found"
+
+    def test_lifespan_rebuilds_routes_with_fresh_llm(self):
+        """Test that a second lifespan rebuilds the chain routes with an open LLM."""
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from app.llm import get_llm
+        from app.main import lifespan
+
+        llms = []
+        route_counts = []
+
+        def build_agent():
+            llms.append(get_llm())
+            return MockRunnable("agent")
+
+        test_app = FastAPI(lifespan=lifespan)
+        # ChatOpenAI returns its kwargs, so each built LLM exposes its own HTTP clients
+        with patch('app.llm.ChatOpenAI', side_effect=lambda **kwargs: kwargs), \
+                patch('app.agent.get_agent', side_effect=build_agent), \
+                patch('app.chains.get_rag_chain', return_value=MockRunnable("rag")):
+            get_llm.cache_clear()
+            for _ in range(2):
+                with TestClient(test_app) as test_client:
+                    assert not llms[-1]["http_async_client"].is_closed
+                    assert "/agent/invoke" in test_client.get("/openapi.json").json()["paths"]
+                    route_counts.append(len(test_app.routes))
+
+        assert len(llms) == 2
+        assert llms[0] is not llms[1]
+        assert route_counts[0] == route_counts[1]
+        assert all(llm["http_async_client"].is_closed for llm in llms)
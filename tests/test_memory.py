@@ -3,7 +3,7 @@ Unit tests for the memory module.
 """
 
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 from app.memory import get_memory
 
 
@@ -13,7 +13,7 @@ class TestMemory:
     def test_get_memory_returns_conversation_buffer_memory(self):
         """Test that get_memory returns a ConversationBufferMemory instance."""
         with patch('app.memory.ConversationBufferMemory') as mock_memory:
-            mock_instance = MagicMock()
+            mock_instance = object()
             mock_memory.return_value = mock_instance
             
             result = get_memory()
@@ -24,7 +24,7 @@ class TestMemory:
     def test_get_memory_configures_memory_key(self):
         """Test that get_memory configures memory with correct key."""
         with patch('app.memory.ConversationBufferMemory') as mock_memory:
-            mock_instance = MagicMock()
+            mock_instance = object()
             mock_memory.return_value = mock_instance
             
             get_memory()
@@ -36,7 +36,7 @@ class TestMemory:
     def test_get_memory_returns_messages_enabled(self):
         """Test that get_memory enables return_messages."""
         with patch('app.memory.ConversationBufferMemory') as mock_memory:
-            mock_instance = MagicMock()
+            mock_instance = object()
             mock_memory.return_value = mock_instance
             
             get_memory()
@@ -1,8 +1,33 @@
+import json
+import os
 import sys
 import types
 
+import pytest
+
+import app.pdfconv.utils as utils
 from app.pdfconv.message_builder import MessageBuilder
 from app.pdfconv.ai import PdfConverter
+from app.pdfconv.cache import ChunkCache
+from app.pdfconv.config import ConversionConfig, LLMProviderConfig
+from app.pdfconv.exceptions import PdfConverterException
+from app.pdfconv.utils import FileManager, PdfChunk, PdfUtils
+
+# Stand-in chunk bytes for tests where the PDF is never parsed
+PDF_BYTES = b"%PDF-"
+
+
+def blank_pdf(tmp_path, pages):
+    """Write a PDF of blank pages to tmp_path and return its path."""
+    import PyPDF2
+
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    pdf_path = tmp_path / "blank.pdf"
+    with open(pdf_path, "wb") as f:
+        writer.write(f)
+    return pdf_path
 
 
 class DummyMsg:
@@ -26,22 +51,25 @@ class DummyLLM:
         return r
 
 
-def _ensure_humanmessage(monkeypatch):
-    # Create fake langchain_core.messages.HumanMessage
-    pkg = types.ModuleType("langchain_core")
+@pytest.fixture(scope="module", autouse=True)
+def _fake_langchain_core():
+    # Swap in a fake langchain_core.messages.HumanMessage once for the module
     messages_mod = types.ModuleType("langchain_core.messages")
     messages_mod.HumanMessage = DummyMsg
-    pkg.messages = messages_mod
-    monkeypatch.setitem(sys.modules, "langchain_core", pkg)
-    monkeypatch.setitem(sys.modules, "langchain_core.messages", messages_mod)
 
+    saved = sys.modules.get("langchain_core.messages")
+    sys.modules["langchain_core.messages"] = messages_mod
+    yield
+    if saved is None:
+        sys.modules.pop("langchain_core.messages", None)
+    else:
+        sys.modules["langchain_core.messages"] = saved
 
-def test_messagebuilder_structured_supported(monkeypatch):
-    _ensure_humanmessage(monkeypatch)
 
+def test_messagebuilder_structured_supported():
     msg = MessageBuilder.build_message(
         prompt="hello",
-        chunk_data=b"%PDF-",
+        chunk_data=PDF_BYTES,
         llm_type="groq",
         use_structured_messages=True,
         extract_text=False,
@@ -51,12 +79,10 @@ def test_messagebuilder_structured_supported(monkeypatch):
     assert isinstance(msg.content, list)
 
 
-def test_messagebuilder_fallback_to_string(monkeypatch):
-    _ensure_humanmessage(monkeypatch)
-
+def test_messagebuilder_fallback_to_string():
     msg = MessageBuilder.build_message(
         prompt="hello",
-        chunk_data=b"%PDF-",
+        chunk_data=PDF_BYTES,
         llm_type="openai",
         use_structured_messages=True,
         extract_text=False,
@@ -68,8 +94,6 @@ def test_messagebuilder_fallback_to_string(monkeypatch):
 
 
 def test_messagebuilder_extract_text(monkeypatch):
-    _ensure_humanmessage(monkeypatch)
-
     class FakePage:
         def extract_text(self):
             return "col1,col2\n1,2"
@@ -79,12 +103,11 @@ def test_messagebuilder_extract_text(monkeypatch):
             self.pages = [FakePage()]
 
     # Patch PdfUtils.extract_text to use our fake reader
-    import app.pdfconv.utils as utils
     monkeypatch.setattr(utils.PdfUtils, "extract_text", lambda data: "col1,col2\n1,2")
 
     msg = MessageBuilder.build_message(
         prompt="hello",
-        chunk_data=b"%PDF-",
+        chunk_data=PDF_BYTES,
         llm_type="openai",
         use_structured_messages=False,
         extract_text=True,
@@ -94,16 +117,15 @@ def test_messagebuilder_extract_text(monkeypatch):
     assert "col1,col2" in (msg.content if isinstance(msg.content, str) else str(msg.content))
 
 
-def test_pdfconverter_invoke(monkeypatch):
+def test_pdfconverter_invoke():
     # Ensure HumanMessage exists in langchain_core
-    _ensure_humanmessage(monkeypatch)
 
     converter = PdfConverter()
     llm = DummyLLM()
 
     # Call internal conversion method (mimics a chunk)
     result = converter._convert_chunk(
-        chunk_data=b"%PDF-",
+        chunk_data=PDF_BYTES,
         llm=llm,
         llm_type="openai",
         chunk_info="",
@@ -114,3 +136,444 @@ def test_pdfconverter_invoke(monkeypatch):
     )
 
     assert "col1,col2" in result
+
+
+def test_process_chunks_keeps_order_and_stops_at_failure(monkeypatch):
+    converter = PdfConverter()
+
+    def fake_convert_chunk(chunk_data, **kwargs):
+        if chunk_data == b"3":
+            raise ValueError("boom")
+        return f"row{chunk_data.decode()}"
+
+    monkeypatch.setattr(converter, "_convert_chunk", fake_convert_chunk)
+
+    chunks = [PdfChunk(data=str(i).encode(), start_page=i, end_page=i, total_pages=5) for i in range(1, 6)]
+    config = ConversionConfig(max_concurrent_llm_tasks=3)
+
+    assert converter._process_chunks(chunks[:2], None, "openai", config) == "row1\nrow2"
+    assert converter._process_chunks(chunks, None, "openai", config) == "row1\nrow2"
+
+
+def test_process_chunks_failure_leaves_no_output_file(monkeypatch, tmp_path):
+    converter = PdfConverter()
+
+    def fake_convert_chunk(chunk_data, **kwargs):
+        if chunk_data == b"2":
+            raise ValueError("boom")
+        return f"row{chunk_data.decode()}"
+
+    monkeypatch.setattr(converter, "_convert_chunk", fake_convert_chunk)
+
+    chunks = [PdfChunk(data=str(i).encode(), start_page=i, end_page=i, total_pages=3) for i in (1, 2, 3)]
+    output = tmp_path / "out.csv"
+
+    assert converter._process_chunks(chunks, None, "openai", ConversionConfig(), str(output)) == "row1"
+    assert not output.exists()
+    assert not (tmp_path / "out.csv.tmp").exists()
+    assert (tmp_path / "out.csv.partial_1").read_text() == "row1"
+
+
+async def test_aprocess_chunks_uses_ainvoke():
+    class AsyncDummyLLM(DummyLLM):
+        async def ainvoke(self, messages):
+            return self.invoke(messages)
+
+    converter = PdfConverter()
+    chunks = [PdfChunk(data=PDF_BYTES, start_page=i, end_page=i, total_pages=2) for i in (1, 2)]
+    config = ConversionConfig(remove_header_if_not_first=True)
+
+    result = await converter._aprocess_chunks(chunks, AsyncDummyLLM(), "openai", config)
+
+    assert result == "col1,col2\n1,2\n1,2"
+
+
+async def test_aconvert_runs_blocking_steps_off_the_event_loop(monkeypatch, tmp_path):
+    import threading
+
+    class AsyncDummyLLM(DummyLLM):
+        async def ainvoke(self, messages):
+            return self.invoke(messages)
+
+    pdf_path = blank_pdf(tmp_path, 3)
+    loop_thread = threading.get_ident()
+    threads = []
+    converter = PdfConverter()
+    monkeypatch.setattr(
+        LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: AsyncDummyLLM())
+    )
+
+    real_split = PdfUtils.split_into_chunks
+    real_prepare = converter._prepare_chunk
+
+    def recording_split(*args):
+        threads.append(threading.get_ident())
+        return real_split(*args)
+
+    def recording_prepare(**kwargs):
+        threads.append(threading.get_ident())
+        return real_prepare(**kwargs)
+
+    monkeypatch.setattr(PdfUtils, "split_into_chunks", staticmethod(recording_split))
+    monkeypatch.setattr(converter, "_prepare_chunk", recording_prepare)
+
+    result = await converter.aconvert(str(pdf_path), llm_type="openai", max_pages_per_chunk=1)
+
+    assert result.startswith("col1,col2")
+    assert len(threads) == 4
+    assert loop_thread not in threads
+
+
+def test_convert_warns_that_use_async_ignores_grouping(monkeypatch, capsys):
+    converter = PdfConverter()
+
+    async def fake_aconvert(**kwargs):
+        return "h"
+
+    monkeypatch.setattr(converter, "aconvert", fake_aconvert)
+
+    assert converter.convert("in.pdf", use_async=True, chunks_per_request=2) == "h"
+    assert "use_async ignores" in capsys.readouterr().out
+
+
+def test_convert_chunk_reuses_cached_result():
+    calls = []
+
+    class CountingLLM(DummyLLM):
+        def invoke(self, messages):
+            calls.append(messages)
+            return super().invoke(messages)
+
+    converter = PdfConverter()
+    llm = CountingLLM()
+    kwargs = dict(chunk_data=PDF_BYTES, llm=llm, llm_type="openai")
+
+    first = converter._convert_chunk(**kwargs)
+    second = converter._convert_chunk(**kwargs)
+    converter._convert_chunk(**kwargs, is_first_chunk=False, remove_header_if_not_first=True)
+
+    assert first == second
+    assert len(calls) == 2
+
+
+def test_split_into_chunks_accepts_bytes_and_caches(tmp_path):
+    pdf_path = blank_pdf(tmp_path, 3)
+
+    pdf_data = PdfUtils.read_pdf(str(pdf_path))
+    chunks = PdfUtils.split_into_chunks(pdf_data, 2)
+
+    assert PdfUtils.get_page_count(pdf_data) == 3
+    assert [(c.start_page, c.end_page) for c in chunks] == [(1, 2), (3, 3)]
+    # Later splits of the same content come from the cache
+    assert PdfUtils.split_into_chunks(str(pdf_path), 2) == chunks
+    assert PdfUtils.split_into_chunks(pdf_data, 2) is PdfUtils.split_into_chunks(str(pdf_path), 2)
+
+    # The PyPDF2 fallback (used without pikepdf) splits the same way
+    fallback = list(PdfUtils._iter_with_pypdf2(pdf_data, 2))
+    assert [(c.start_page, c.end_page) for c in fallback] == [(1, 2), (3, 3)]
+    assert [PdfUtils.get_page_count(c.data) for c in fallback] == [2, 1]
+
+
+def test_chunk_cache_evicts_over_byte_budget():
+    cache = ChunkCache(max_entries=8, ttl=None, max_bytes=10)
+    cache.set("a", "first", size=6)
+    cache.set("b", "second", size=6)
+    # Too big to ever fit, so it is not cached and evicts nothing
+    cache.set("c", "third", size=11)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "second"
+    assert cache.get("c") is None
+    assert len(cache) == 1
+
+
+def test_convert_hashes_pdf_once(monkeypatch, tmp_path):
+    pdf_path = blank_pdf(tmp_path, 3)
+    pdf_data = pdf_path.read_bytes()
+
+    hashed = []
+    real_make_key = ChunkCache.make_key
+    monkeypatch.setattr(
+        ChunkCache, "make_key", staticmethod(lambda data, *parts: hashed.append(data) or real_make_key(data, *parts))
+    )
+    converter = PdfConverter()
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+    monkeypatch.setattr(converter, "_convert_chunk", lambda chunk_data, **kwargs: "h\nrow")
+
+    converter.convert(str(pdf_path), llm_type="openai", max_pages_per_chunk=2)
+
+    assert hashed.count(pdf_data) == 1
+
+
+def test_extracted_text_over_context_warns(monkeypatch, capsys):
+    monkeypatch.setattr(utils.PdfUtils, "extract_text", lambda data: "col1,col2\n1,2")
+    monkeypatch.setattr(LLMProviderConfig, "count_tokens", classmethod(lambda cls, llm_type, text: 10**7))
+
+    converter = PdfConverter()
+    result = converter._convert_chunk(chunk_data=PDF_BYTES, llm=DummyLLM(), llm_type="openai", extract_text=True)
+
+    assert "col1,col2" in result
+    assert "context" in capsys.readouterr().out
+
+
+def test_process_chunks_batch_dispatches_results_in_order(monkeypatch):
+    class FakeBatchClient:
+        def __init__(self):
+            self.files = self
+            self.batches = self
+            self.submitted = None
+
+        def create(self, **kwargs):
+            if "purpose" in kwargs:
+                self.submitted = [json.loads(line) for line in kwargs["file"][1].decode().splitlines()]
+                return types.SimpleNamespace(id="file-in")
+            return types.SimpleNamespace(id="batch-1", status="in_progress")
+
+        def retrieve(self, batch_id):
+            return types.SimpleNamespace(
+                id=batch_id, status="completed", output_file_id="file-out", error_file_id=None
+            )
+
+        def content(self, file_id):
+            # Results come back in arbitrary order
+            lines = [
+                json.dumps({
+                    "custom_id": req["custom_id"],
+                    "response": {"status_code": 200, "body": {"choices": [{"message": {
+                        "content": f"```csv\nh\n{req['custom_id']}\n```"
+                    }}]}},
+                })
+                for req in reversed(self.submitted)
+            ]
+            return types.SimpleNamespace(text="\n".join(lines))
+
+    client = FakeBatchClient()
+    monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(OpenAI=lambda: client))
+
+    converter = PdfConverter()
+    chunks = [PdfChunk(data=str(i).encode(), start_page=i, end_page=i, total_pages=3) for i in (1, 2, 3)]
+    config = ConversionConfig(remove_header_if_not_first=True, batch_poll_interval=0)
+
+    result = converter._process_chunks_batch(chunks, "openai", config)
+
+    assert len(client.submitted) == 3
+    assert result == "h\nchunk-0\nchunk-1\nchunk-2"
+
+
+def test_process_chunks_writes_output_incrementally(monkeypatch, tmp_path):
+    converter = PdfConverter()
+    monkeypatch.setattr(converter, "_convert_chunk", lambda chunk_data, **kwargs: f"h\nrow{chunk_data.decode()}")
+
+    chunks = [PdfChunk(data=str(i).encode(), start_page=i, end_page=i, total_pages=3) for i in (1, 2, 3)]
+    output = tmp_path / "out.csv"
+    config = ConversionConfig(remove_header_if_not_first=True, return_full=False)
+
+    assert converter._process_chunks(chunks, None, "openai", config, str(output)) == ""
+    assert output.read_text() == "h\nrow1\nrow2\nrow3"
+
+
+def test_process_chunks_grouped_splits_response_per_chunk():
+    class MultiChunkLLM:
+        def __init__(self):
+            self.calls = 0
+
+        def invoke(self, messages):
+            self.calls += 1
+            numbers = [part["text"].split(">>>")[0][len("<<<CHUNK "):]
+                       for part in messages[0].content if part.get("text", "").startswith("<<<CHUNK")]
+            return DummyMsg("```csv\n" + "\n".join(f"<<<CHUNK {n}>>>\nh\nrow{n}" for n in numbers) + "\n```")
+
+    converter = PdfConverter()
+    llm = MultiChunkLLM()
+    chunks = [PdfChunk(data=PDF_BYTES, start_page=i, end_page=i, total_pages=5) for i in range(1, 6)]
+    config = ConversionConfig(remove_header_if_not_first=True, chunks_per_request=2)
+
+    result = converter._process_chunks_grouped(chunks, llm, "openai", config)
+
+    assert llm.calls == 3
+    assert result == "h\nrow1\nrow2\nrow3\nrow4\nrow5"
+
+
+def test_convert_sends_single_chunks_to_unstructured_provider(monkeypatch, tmp_path):
+    pdf_path = blank_pdf(tmp_path, 4)
+
+    calls = []
+    converter = PdfConverter()
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+    monkeypatch.setattr(
+        converter, "_process_chunks_grouped", lambda *args, **kwargs: pytest.fail("grouped request sent")
+    )
+    monkeypatch.setattr(
+        converter, "_convert_chunk", lambda chunk_data, **kwargs: calls.append(chunk_data) or "h\nrow"
+    )
+
+    # google messages are flattened to a string, so chunks can't share a request
+    assert not LLMProviderConfig.supports_multi_chunk_requests("google")
+    converter.convert(str(pdf_path), llm_type="google", max_pages_per_chunk=1, chunks_per_request=2)
+    assert len(calls) == 4
+
+
+def test_save_chunks_handles_short_writev(monkeypatch, tmp_path):
+    real_writev = os.writev
+
+    def short_writev(fd, buffers):
+        # Write at most 3 bytes per call, like a kernel stopping early
+        return real_writev(fd, [bytes(buffers[0][:3])])
+
+    monkeypatch.setattr(os, "writev", short_writev)
+
+    output = tmp_path / "partial.csv"
+    FileManager.save_chunks(["h,v\n1,2", "3,4", "5,6"], str(output))
+
+    assert output.read_text() == "h,v\n1,2\n3,4\n5,6"
+
+
+def test_save_chunks_stops_when_writev_writes_nothing(monkeypatch, tmp_path, capsys):
+    monkeypatch.setattr(os, "writev", lambda fd, buffers: 0)
+
+    FileManager.save_chunks(["h,v", "1,2"], str(tmp_path / "partial.csv"))
+
+    assert "writev wrote no bytes" in capsys.readouterr().out
+
+
+def _sysconf_indeterminate(name):
+    return -1
+
+
+def _sysconf_unknown_name(name):
+    raise ValueError(f"unrecognized configuration name: {name}")
+
+
+@pytest.mark.parametrize("sysconf", [_sysconf_indeterminate, _sysconf_unknown_name])
+def test_iov_max_falls_back_when_unknown(monkeypatch, sysconf):
+    monkeypatch.setattr(os, "sysconf", sysconf)
+
+    assert utils._iov_max() == 1024
+
+
+def test_convert_reuses_cached_document(monkeypatch, tmp_path):
+    pdf_path = blank_pdf(tmp_path, 3)
+
+    calls = []
+    converter = PdfConverter()
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+    monkeypatch.setattr(
+        converter, "_convert_chunk", lambda chunk_data, **kwargs: calls.append(chunk_data) or "h\nrow"
+    )
+
+    first = converter.convert(str(pdf_path), llm_type="openai", max_pages_per_chunk=2)
+    assert len(calls) == 2
+
+    output = tmp_path / "out.csv"
+    assert converter.convert(str(pdf_path), str(output), llm_type="openai", max_pages_per_chunk=2) == first
+    assert len(calls) == 2
+    assert output.read_text() == first
+
+
+def test_corrupt_pdf_split_raises_converter_exception(monkeypatch, tmp_path):
+    # The page count reads, but the body is garbage, so splitting fails lazily
+    pdf_path = tmp_path / "corrupt.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4\n" + b"\x00garbage" * 64)
+    monkeypatch.setattr(PdfUtils, "get_page_count", staticmethod(lambda pdf, content_key=None: 4))
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+
+    calls = []
+    converter = PdfConverter()
+    monkeypatch.setattr(converter, "_convert_chunk", lambda chunk_data, **kwargs: calls.append(chunk_data) or "h")
+
+    with pytest.raises(PdfConverterException, match="Failed to prepare PDF"):
+        converter.convert(str(pdf_path), llm_type="openai", max_pages_per_chunk=1)
+    with pytest.raises(PdfConverterException, match="Failed to prepare PDF"):
+        list(converter.convert_streaming(str(pdf_path), llm_type="openai", max_pages_per_chunk=1))
+    assert calls == []
+
+
+def _chunk_page(kwargs):
+    """First page of the chunk a _convert_chunk call is for, from its chunk_info."""
+    return int(kwargs["chunk_info"].split()[1].split("-")[0])
+
+
+def test_convert_streaming_yields_in_order_when_chunks_finish_out_of_order(monkeypatch, tmp_path):
+    import threading
+
+    pdf_path = blank_pdf(tmp_path, 4)
+    later_chunks_done = threading.Semaphore(0)
+    finished = []
+
+    def fake_convert_chunk(chunk_data, **kwargs):
+        page = _chunk_page(kwargs)
+        if page == 1:
+            # Hold the first chunk back until every other chunk has finished
+            for _ in range(3):
+                assert later_chunks_done.acquire(timeout=5)
+        finished.append(page)
+        if page != 1:
+            later_chunks_done.release()
+        return f"h\nrow{page}"
+
+    converter = PdfConverter()
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+    monkeypatch.setattr(converter, "_convert_chunk", fake_convert_chunk)
+
+    output = tmp_path / "out.csv"
+    results = list(converter.convert_streaming(
+        str(pdf_path), str(output), llm_type="openai", max_pages_per_chunk=1,
+        remove_header_if_not_first=True, max_concurrent_llm_tasks=4
+    ))
+
+    assert finished[-1] == 1
+    assert results == ["h\nrow1", "row2", "row3", "row4"]
+    assert output.read_text() == "h\nrow1\nrow2\nrow3\nrow4"
+
+
+def test_convert_streaming_stops_at_first_failed_chunk(monkeypatch, tmp_path):
+    pdf_path = blank_pdf(tmp_path, 4)
+
+    def fake_convert_chunk(chunk_data, **kwargs):
+        page = _chunk_page(kwargs)
+        if page == 3:
+            raise RuntimeError("boom")
+        return f"h\nrow{page}"
+
+    converter = PdfConverter()
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+    monkeypatch.setattr(converter, "_convert_chunk", fake_convert_chunk)
+
+    output = tmp_path / "out.csv"
+    results = list(converter.convert_streaming(
+        str(pdf_path), str(output), llm_type="openai", max_pages_per_chunk=1, max_concurrent_llm_tasks=2
+    ))
+
+    assert results == ["h\nrow1", "h\nrow2"]
+    assert (tmp_path / "out.csv.partial_2").read_text() == "h\nrow1\nh\nrow2"
+
+
+def test_convert_streaming_close_stops_submitting_chunks(monkeypatch, tmp_path):
+    import threading
+    import time
+
+    pdf_path = blank_pdf(tmp_path, 6)
+    release = threading.Event()
+    started = []
+
+    def fake_convert_chunk(chunk_data, **kwargs):
+        page = _chunk_page(kwargs)
+        started.append(page)
+        if page != 1:
+            release.wait(timeout=5)
+        return f"h\nrow{page}"
+
+    converter = PdfConverter()
+    monkeypatch.setattr(LLMProviderConfig, "create_client", classmethod(lambda cls, llm_type, **kwargs: None))
+    monkeypatch.setattr(converter, "_convert_chunk", fake_convert_chunk)
+
+    stream = converter.convert_streaming(
+        str(pdf_path), llm_type="openai", max_pages_per_chunk=1, max_concurrent_llm_tasks=2
+    )
+    assert next(stream) == "h\nrow1"
+    stream.close()
+    release.set()
+    time.sleep(0.1)
+
+    # Only the window (two chunks plus the one refilled before waiting) was ever submitted
+    assert max(started) <= 3
@@ -1,8 +1,21 @@
 import csv
+import io
+import sys
 import types
 import pytest
 
-import app.pdfconvbasic as pdfconvbasic
+import app.pdfconv.basic as basic
+from app.pdfconv.pdfconv import main
+
+# The reader is faked in every test, so the bytes are never parsed
+FAKE_PDF = b"%PDF-1.4"
+
+
+@pytest.fixture
+def pdf_stdin(monkeypatch):
+    """Feed FAKE_PDF to the CLI on stdin (input '-') instead of writing a file."""
+    monkeypatch.setattr(sys, "stdin", types.SimpleNamespace(buffer=io.BytesIO(FAKE_PDF)))
+    return "-"
 
 
 class FakePage:
@@ -13,33 +26,47 @@ class FakePage:
         return self._txt
 
 
-def test_text_output_prints_extracted_text(tmp_path, monkeypatch, capsys):
+def test_text_output_prints_extracted_text(pdf_stdin, monkeypatch, capsys):
+    def Reader(data):
+        return types.SimpleNamespace(pages=[FakePage("one"), FakePage("two")])
+
+    monkeypatch.setattr(basic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
+
+    rc = main([pdf_stdin, "--format", "text"])
+    captured = capsys.readouterr()
+
+    assert rc == 0
+    assert captured.out == "one\ntwo\n"
+
+
+def test_text_output_reads_pdf_from_path(tmp_path, monkeypatch, capsys):
     pdf = tmp_path / "in.pdf"
-    pdf.write_bytes(b"%PDF-1.4")
+    pdf.write_bytes(FAKE_PDF)
+    read = []
 
     def Reader(data):
+        read.append(data.getvalue())
         return types.SimpleNamespace(pages=[FakePage("one"), FakePage("two")])
 
-    monkeypatch.setattr(pdfconvbasic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
+    monkeypatch.setattr(basic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
 
-    rc = pdfconvbasic.main([str(pdf), "--format", "text"])
+    rc = main([str(pdf), "--format", "text"])
     captured = capsys.readouterr()
 
     assert rc == 0
+    assert read == [FAKE_PDF]
     assert captured.out == "one\ntwo\n"
 
 
-def test_csv_writes_file(tmp_path, monkeypatch):
-    pdf = tmp_path / "in.pdf"
+def test_csv_writes_file(tmp_path, pdf_stdin, monkeypatch):
     out = tmp_path / "out.csv"
-    pdf.write_bytes(b"%PDF-1.4")
 
     def Reader(data):
         return types.SimpleNamespace(pages=[FakePage("a"), FakePage("b\nc")])
 
-    monkeypatch.setattr(pdfconvbasic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
+    monkeypatch.setattr(basic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
 
-    rc = pdfconvbasic.main([str(pdf), "--format", "csv", "--output", str(out)])
+    rc = main([pdf_stdin, "--format", "csv", "--output", str(out)])
     assert rc == 0
 
     with open(out, newline="", encoding="utf-8") as f:
@@ -50,18 +77,16 @@ def test_csv_writes_file(tmp_path, monkeypatch):
     assert rows[2] == ["2", "b c"]
 
 
-def test_csv_dedupes_common_header(tmp_path, monkeypatch):
-    pdf = tmp_path / "in.pdf"
+def test_csv_dedupes_common_header(tmp_path, pdf_stdin, monkeypatch):
     out = tmp_path / "out.csv"
-    pdf.write_bytes(b"%PDF-1.4")
 
     hdr = "11 GRACE BILL ROAD, EKET\n"
     def Reader(data):
         return types.SimpleNamespace(pages=[FakePage(hdr + "page1 content"), FakePage(hdr + "page2 content")])
 
-    monkeypatch.setattr(pdfconvbasic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
+    monkeypatch.setattr(basic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
 
-    rc = pdfconvbasic.main([str(pdf), "--format", "csv", "--output", str(out)])
+    rc = main([pdf_stdin, "--format", "csv", "--output", str(out)])
     assert rc == 0
 
     with open(out, newline="", encoding="utf-8") as f:
@@ -71,17 +96,15 @@ def test_csv_dedupes_common_header(tmp_path, monkeypatch):
     assert rows[2] == ["2", "page2 content"]
 
 
-def test_csv_preserve_newlines_flag(tmp_path, monkeypatch):
-    pdf = tmp_path / "in.pdf"
+def test_csv_preserve_newlines_flag(tmp_path, pdf_stdin, monkeypatch):
     out = tmp_path / "out.csv"
-    pdf.write_bytes(b"%PDF-1.4")
 
     def Reader(data):
         return types.SimpleNamespace(pages=[FakePage("a\nb\nc")])
 
-    monkeypatch.setattr(pdfconvbasic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
+    monkeypatch.setattr(basic, "PyPDF2", types.SimpleNamespace(PdfReader=Reader))
 
-    rc = pdfconvbasic.main([str(pdf), "--format", "csv", "--output", str(out), "--preserve-newlines"]) 
+    rc = main([pdf_stdin, "--format", "csv", "--output", str(out), "--preserve-newlines"]) 
     assert rc == 0
 
     with open(out, newline="", encoding="utf-8") as f:
@@ -91,11 +114,28 @@ def test_csv_preserve_newlines_flag(tmp_path, monkeypatch):
     assert rows[1][1] == "a\nb\nc"
 
 
-def test_csv_requires_output(tmp_path):
-    pdf = tmp_path / "in.pdf"
-    pdf.write_bytes(b"%PDF-1.4")
+def test_csv_requires_output(pdf_stdin):
 
     with pytest.raises(SystemExit) as exc:
-        pdfconvbasic.main([str(pdf), "--format", "csv"])  # missing --output
+        main([pdf_stdin, "--format", "csv"])  # missing --output
 
     assert exc.value.code != 0
+
+
+@pytest.mark.parametrize("strings", [
+    ["header\nrow one", "header\nrow two", "header\nrow three, longer", "header\nr"],
+    ["Émetteur: Société\n1", "Émetteur: Société\n22", "Émetteur: Société\n333", "Émetteur: Soci"],
+    ["abc", "", "abc", "abcd"],
+    ["", "", "", ""],
+    ["same", "same", "same", "same", "same"],
+    ["€ 100", "€ 200", "$ 100", "€ 300"],
+])
+def test_find_common_prefix_numpy_matches_python_loop(monkeypatch, strings):
+    assert len(strings) >= basic._NUMPY_MIN_STRINGS
+    if basic.np is None:
+        pytest.skip("numpy is not installed")
+    # max_len=10 also checks truncation against the strings' own lengths
+    fast = [basic._find_common_prefix(strings, max_len) for max_len in (10, 1000)]
+
+    monkeypatch.setattr(basic, "np", None)
+    assert fast == [basic._find_common_prefix(strings, max_len) for max_len in (10, 1000)]
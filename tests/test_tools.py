@@ -3,123 +3,76 @@ Unit tests for the tools module.
 """
 
 import pytest
-from app.tools import calculator, get_tools, calculator_tool, search_tool, search_notes
-
-
-class TestCalculator:
-    """Tests for the calculator tool function."""
-    
-    def test_calculator_addition(self):
-        """Test calculator performs addition correctly."""
-        result = calculator("2 + 2")
-        assert result == "4"
-    
-    def test_calculator_subtraction(self):
-        """Test calculator performs subtraction correctly."""
-        result = calculator("10 - 3")
-        assert result == "7"
-    
-    def test_calculator_multiplication(self):
-        """Test calculator performs multiplication correctly."""
-        result = calculator("5 * 6")
-        assert result == "30"
-    
-    def test_calculator_division(self):
-        """Test calculator performs division correctly."""
-        result = calculator("20 / 4")
-        assert result == "5.0"
-    
-    def test_calculator_complex_expression(self):
-        """Test calculator handles complex expressions."""
-        result = calculator("(10 + 5) * 2")
-        assert result == "30"
-    
-    def test_calculator_returns_string(self):
-        """Test that calculator returns result as string."""
-        result = calculator("1 + 1")
-        assert isinstance(result, str)
-
-
-class TestCalculatorTool:
-    """Tests for the calculator Tool object."""
-    
-    def test_calculator_tool_has_correct_name(self):
-        """Test that calculator tool has correct name."""
-        assert calculator_tool.name == "calculator"
-    
-    def test_calculator_tool_has_description(self):
-        """Test that calculator tool has description."""
-        assert calculator_tool.description == "Evaluate mathematical expressions"
-    
-    def test_calculator_tool_is_callable(self):
-        """Test that calculator tool has func attribute."""
-        assert callable(calculator_tool.func)
-    
-    def test_calculator_tool_func_works(self):
-        """Test that calculator tool's func works correctly."""
-        result = calculator_tool.func("3 + 3")
-        assert result == "6"
-
-
-class TestSearchNotes:
-    """Tests for the search_notes function."""
-    
-    def test_search_notes_returns_string(self):
-        """Test that search_notes returns a string."""
-        result = search_notes("test query")
-        assert isinstance(result, str)
-    
-    def test_search_notes_returns_expected_message(self):
-        """Test that search_notes returns the expected message."""
-        result = search_notes("anything")
-        assert "retrieval chain" in result.lower()
-
-
-class TestSearchTool:
-    """Tests for the search_tool Tool object."""
-    
-    def test_search_tool_has_correct_name(self):
-        """Test that search tool has correct name."""
-        assert search_tool.name == "search_notes"
-    
-    def test_search_tool_has_description(self):
-        """Test that search tool has description."""
-        assert search_tool.description == "Search internal ML notes"
-    
-    def test_search_tool_is_callable(self):
-        """Test that search tool has func attribute."""
-        assert callable(search_tool.func)
-
-
-class TestGetTools:
-    """Tests for the get_tools factory function."""
-    
-    def test_get_tools_returns_list(self):
-        """Test that get_tools returns a list."""
-        result = get_tools()
-        assert isinstance(result, list)
-    
-    def test_get_tools_returns_two_tools(self):
-        """Test that get_tools returns exactly 2 tools."""
-        result = get_tools()
-        assert len(result) == 2
-    
-    def test_get_tools_includes_calculator(self):
-        """Test that get_tools includes calculator tool."""
-        result = get_tools()
-        tool_names = [t.name for t in result]
-        assert "calculator" in tool_names
-    
-    def test_get_tools_includes_search(self):
-        """Test that get_tools includes search_notes tool."""
-        result = get_tools()
-        tool_names = [t.name for t in result]
-        assert "search_notes" in tool_names
-    
-    def test_get_tools_returns_tool_objects(self):
-        """Test that get_tools returns Tool objects."""
-        result = get_tools()
-        for tool in result:
-            assert hasattr(tool, 'name')
-            assert hasattr(tool, 'func')
-            assert hasattr(tool, 'description')
+from app.tools import calculator as calculator_tool, search_notes as search_tool
+
+# The @tool-decorated names are Tool objects; the plain functions are their func
+calculator = calculator_tool.func
+search_notes = search_tool.func
+
+
+@pytest.mark.parametrize("expr,expected", [
+    ("2 + 2", "4"),
+    ("10 - 3", "7"),
+    ("5 * 6", "30"),
+    ("20 / 4", "5.0"),
+    ("(10 + 5) * 2", "30"),
+    ("1 + 1", "2"),
+    ("3 + 3", "6"),
+])
+def test_calculator_arithmetic(expr, expected):
+    """Test calculator evaluates arithmetic expressions correctly."""
+    assert calculator(expr) == expected
+
+
+@pytest.mark.parametrize("expr", [
+    "9**9**9**9",
+    "(9**99)**99",
+    "2 ** (10 + 1)",
+    "2 ** 101",
+    "10000000000000000000 + 1",
+    "factorial(10**7)",
+    "comb(10**18, 10**9)",
+    "round(1, -10**18)",
+    "round(1, -(2 + 200))",
+])
+def test_calculator_rejects_unbounded_expressions(expr):
+    """Test that calculator refuses expressions that could run without bound."""
+    assert calculator(expr).startswith("Error:")
+
+
+def test_calculator_allows_small_powers():
+    """Test that literal exponents and round() digits within the limit still work."""
+    assert calculator("2 ** 10") == "1024"
+    assert calculator("2 ** -1") == "0.5"
+    assert calculator("round(1234.5678, 2)") == "1234.57"
+    assert calculator("round(1234.5678, -2)") == "1200.0"
+
+
+def test_calculator_returns_string():
+    """Test that calculator returns result as string."""
+    assert isinstance(calculator("1 + 1"), str)
+
+
+def test_search_notes_returns_expected_message():
+    """Test that search_notes returns the expected message."""
+    result = search_notes("anything")
+    assert isinstance(result, str) and "retrieval chain" in result.lower()
+
+
+@pytest.mark.parametrize("tool,name,desc", [
+    (calculator_tool, "calculator", "Evaluate mathematical expressions"),
+    (search_tool, "search_notes", "Search internal ML notes for relevant information"),
+], ids=["calculator", "search_notes"])
+def test_tool_metadata(tool, name, desc):
+    """Test each tool's name, description and callable func."""
+    assert tool.name == name
+    assert tool.description == desc
+    assert callable(tool.func)
+
+
+def test_get_tools_shape(tools_list, tool_names):
+    """Test that get_tools returns a list of the calculator and search_notes Tool objects."""
+    assert isinstance(tools_list, list) and len(tools_list) == 2
+    assert set(tool_names) == {"calculator", "search_notes"}
+    for tool in tools_list:
+        assert callable(tool.func) and tool.description
@@ -0,0 +1,74 @@
+"""
+Unit tests for the vectorstore persistence module.
+"""
+
+import json
+
+import faiss
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import Embeddings
+
+import app.vectorstore as vectorstore
+from app.vectorstore import DOCSTORE_FILE, build_index, build_vectorstore, load_vectorstore, save_vectorstore
+
+
+class FakeEmbeddings(Embeddings):
+    """Deterministic embeddings based on character counts."""
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+    def embed_query(self, text):
+        return [float(text.count(c)) for c in "abcd"]
+
+
+class TestVectorstorePersistence:
+    """Tests for save_vectorstore / load_vectorstore."""
+
+    def test_round_trip_preserves_documents_and_search(self, tmp_path):
+        """Test that a saved store loads back with the same documents and results."""
+        embeddings = FakeEmbeddings()
+        store = FAISS.from_texts(["aaaa", "bbbb", "cccd"], embeddings, metadatas=[{"n": 1}, {"n": 2}, {"n": 3}])
+
+        save_vectorstore(store, str(tmp_path))
+        loaded = load_vectorstore(embeddings, str(tmp_path))
+
+        result = loaded.similarity_search("bbb", k=1)[0]
+        assert result.page_content == "bbbb"
+        assert result.metadata == {"n": 2}
+        assert loaded.index.ntotal == 3
+
+    def test_docstore_is_plain_jsonl(self, tmp_path):
+        """Test that the docstore is written as JSON lines rather than a pickle."""
+        store = FAISS.from_texts(["abcd"], FakeEmbeddings())
+
+        save_vectorstore(store, str(tmp_path))
+
+        lines = (tmp_path / DOCSTORE_FILE).read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[0])["page_content"] == "abcd"
+
+
+class TestBuildIndex:
+    """Tests for choosing the FAISS index type."""
+
+    def test_small_corpus_uses_flat_index(self):
+        """Test that small corpora get an exact flat index."""
+        index = build_index(np.random.rand(10, 8).astype("float32"))
+        assert isinstance(index, faiss.IndexFlatL2)
+        assert index.ntotal == 10
+
+    def test_large_corpus_uses_ivfpq_and_survives_reload(self, tmp_path, monkeypatch):
+        """Test that large corpora get an IVF-PQ index that reloads with nprobe set."""
+        monkeypatch.setattr(vectorstore, "IVF_MIN_VECTORS", 100)
+        texts = [f"doc {i}" for i in range(2000)]
+        vectors = np.random.RandomState(0).rand(2000, 8).astype("float32")
+
+        store = build_vectorstore(texts, vectors, FakeEmbeddings())
+        assert isinstance(store.index, faiss.IndexIVFPQ)
+
+        save_vectorstore(store, str(tmp_path))
+        loaded = load_vectorstore(FakeEmbeddings(), str(tmp_path))
+
+        assert faiss.try_extract_index_ivf(loaded.index).nprobe == vectorstore.IVF_NPROBE
+        assert loaded.index.ntotal == 2000